@@ -1,7 +1,9 @@
 """Action handler for processing AI model outputs."""
 
+import ast
 import time
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any, Callable
 
 from phone_agent.adb import (
@@ -23,6 +25,19 @@ from phone_agent.logging import get_logger
 logger = get_logger("handler")
 
 
+@lru_cache(maxsize=16)
+def _pixel_table(size: int) -> tuple[int, ...]:
+    """Pixel for every relative coordinate 0-1000, as int(e / 1000 * size) gives it."""
+    return tuple(int(e / 1000 * size) for e in range(1001))
+
+
+def _to_pixel(value: int, table: tuple[int, ...], size: int) -> int:
+    """Convert one relative coordinate, looking whole numbers in 0-1000 up in table."""
+    if type(value) is int and 0 <= value <= 1000:
+        return table[value]
+    return int(value / 1000 * size)
+
+
 @dataclass
 class ActionResult:
     """Result of an action execution."""
@@ -42,6 +57,8 @@ class ActionHandler:
         confirmation_callback: Optional callback for sensitive action confirmation.
             Should return True to proceed, False to cancel.
         takeover_callback: Optional callback for takeover requests (login, captcha).
+        width: Optional screen width in pixels, to precompute coordinate lookups.
+        height: Optional screen height in pixels, to precompute coordinate lookups.
     """
 
     def __init__(
@@ -49,10 +66,13 @@ class ActionHandler:
         device_id: str | None = None,
         confirmation_callback: Callable[[str], bool] | None = None,
         takeover_callback: Callable[[str], None] | None = None,
+        width: int | None = None,
+        height: int | None = None,
     ):
         self.device_id = device_id
         self.confirmation_callback = confirmation_callback or self._default_confirmation
         self.takeover_callback = takeover_callback or self._default_takeover
+        self._set_screen_size(width or 0, height or 0)
 
     def execute(
         self, action: dict[str, Any], screen_width: int, screen_height: int
@@ -119,13 +139,22 @@ class ActionHandler:
         }
         return handlers.get(action_name)
 
+    def _set_screen_size(self, screen_width: int, screen_height: int) -> None:
+        """Cache the screen size and its relative-to-pixel lookup tables."""
+        self._screen_size = (screen_width, screen_height)
+        self._pixels_x = _pixel_table(screen_width)
+        self._pixels_y = _pixel_table(screen_height)
+
     def _convert_relative_to_absolute(
         self, element: list[int], screen_width: int, screen_height: int
     ) -> tuple[int, int]:
         """Convert relative coordinates (0-1000) to absolute pixels."""
-        x = int(element[0] / 1000 * screen_width)
-        y = int(element[1] / 1000 * screen_height)
-        return x, y
+        if (screen_width, screen_height) != self._screen_size:
+            self._set_screen_size(screen_width, screen_height)
+        return (
+            _to_pixel(element[0], self._pixels_x, screen_width),
+            _to_pixel(element[1], self._pixels_y, screen_height),
+        )
 
     def _handle_launch(self, action: dict, width: int, height: int) -> ActionResult:
         """Handle app launch action."""
@@ -287,9 +316,6 @@ def parse_action(response: str) -> dict[str, Any]:
     Raises:
         ValueError: If the response cannot be parsed or contains unsafe content.
     """
-    import ast
-    import re
-    
     try:
         response = response.strip()
         
@@ -347,56 +373,35 @@ def _safe_parse_kwargs(args_str: str) -> dict[str, Any]:
     Raises:
         ValueError: If unsafe content is detected.
     """
-    import ast
-    
     if not args_str.strip():
         return {}
     
-    # Wrap in dict() call for AST parsing
-    safe_expr = f"dict({args_str})"
-    
+    # Parse as a call so the keywords come back as individual AST nodes
     try:
-        tree = ast.parse(safe_expr, mode='eval')
+        tree = ast.parse(f"_({args_str})", mode="eval")
     except SyntaxError as e:
         raise ValueError(f"Syntax error in action arguments: {e}")
     
-    # Validate AST - only allow safe nodes
-    for node in ast.walk(tree):
-        # Allow these safe node types
-        if isinstance(node, (
-            ast.Expression,  # Top-level expression
-            ast.Call,        # The dict() call we created
-            ast.keyword,     # Keyword arguments
-            ast.Load,        # Load context
-            # Literal types
-            ast.Constant,    # Python 3.8+ literals (str, int, float, bool, None)
-            ast.Num,         # Legacy number literal
-            ast.Str,         # Legacy string literal
-            ast.NameConstant,# Legacy True/False/None
-            ast.List,        # List literal
-            ast.Dict,        # Dict literal
-            ast.Tuple,       # Tuple literal
-            ast.UnaryOp,     # For negative numbers like -1
-            ast.UAdd,        # Unary +
-            ast.USub,        # Unary -
-        )):
-            # For Call nodes, only allow our 'dict' call
-            if isinstance(node, ast.Call):
-                if not (isinstance(node.func, ast.Name) and node.func.id == 'dict'):
-                    raise ValueError(f"Function calls not allowed (found: {ast.dump(node.func)})")
-            continue
-        
-        # Allow Name only for 'dict' (our wrapper)
-        if isinstance(node, ast.Name):
-            if node.id != 'dict':
-                raise ValueError(f"Variable reference not allowed: {node.id}")
-            continue
-        
-        # Reject everything else
-        raise ValueError(f"Unsafe AST node type: {type(node).__name__}")
+    call = tree.body
+    # The outer call must be our own `_`; anything else means the arguments
+    # closed it early and chained another call or attribute onto it
+    if not (isinstance(call, ast.Call) and isinstance(call.func, ast.Name) and call.func.id == "_"):
+        raise ValueError("Unexpected content after action arguments")
+    if call.args:
+        raise ValueError("Only keyword arguments are allowed")
+    
+    result: dict[str, Any] = {}
+    for kw in call.keywords:
+        if kw.arg is None:
+            raise ValueError("Argument unpacking not allowed")
+        if kw.arg in result:
+            raise ValueError(f"Duplicate argument: {kw.arg}")
+        # literal_eval rejects names, calls, attribute access and the like
+        try:
+            result[kw.arg] = ast.literal_eval(kw.value)
+        except (ValueError, TypeError, SyntaxError, RecursionError):
+            raise ValueError(f"Unsafe value for argument '{kw.arg}': {ast.dump(kw.value)[:200]}")
     
-    # Safe to evaluate - we've verified it only contains literals
-    result = eval(compile(tree, '<action>', 'eval'), {"dict": dict, "__builtins__": {}})
     return result
 
 
@@ -428,10 +433,13 @@ class AsyncActionHandler:
         device_id: str | None = None,
         confirmation_callback: Callable[[str], bool] | None = None,
         takeover_callback: Callable[[str], None] | None = None,
+        width: int | None = None,
+        height: int | None = None,
     ):
         self.device_id = device_id
         self.confirmation_callback = confirmation_callback or self._default_confirmation
         self.takeover_callback = takeover_callback or self._default_takeover
+        self._set_screen_size(width or 0, height or 0)
     
     async def execute(
         self, action: dict[str, Any], screen_width: int, screen_height: int
@@ -489,13 +497,22 @@ class AsyncActionHandler:
         }
         return handlers.get(action_name)
     
+    def _set_screen_size(self, screen_width: int, screen_height: int) -> None:
+        """Cache the screen size and its relative-to-pixel lookup tables."""
+        self._screen_size = (screen_width, screen_height)
+        self._pixels_x = _pixel_table(screen_width)
+        self._pixels_y = _pixel_table(screen_height)
+
     def _convert_relative_to_absolute(
         self, element: list[int], screen_width: int, screen_height: int
     ) -> tuple[int, int]:
         """Convert relative coordinates (0-1000) to absolute pixels."""
-        x = int(element[0] / 1000 * screen_width)
-        y = int(element[1] / 1000 * screen_height)
-        return x, y
+        if (screen_width, screen_height) != self._screen_size:
+            self._set_screen_size(screen_width, screen_height)
+        return (
+            _to_pixel(element[0], self._pixels_x, screen_width),
+            _to_pixel(element[1], self._pixels_y, screen_height),
+        )
     
     async def _handle_launch(self, action: dict, width: int, height: int) -> ActionResult:
         """Handle app launch action."""
@@ -0,0 +1,94 @@
+"""Minimal async client for the ADB server host protocol."""
+
+import asyncio
+
+from phone_agent.exceptions import DeviceCommandError
+
+ADB_SERVER_HOST = "127.0.0.1"
+ADB_SERVER_PORT = 5037
+
+
+def _encode_request(service: str) -> bytes:
+    """Encode a service request as a 4-hex-digit length prefix plus payload."""
+    payload = service.encode("utf-8")
+    return b"%04x%s" % (len(payload), payload)
+
+
+def _host_service(service: str, device_id: str | None) -> str:
+    """Build a host service name, targeting a specific device if given."""
+    if device_id:
+        return f"host-serial:{device_id}:{service}"
+    return f"host:{service}"
+
+
+async def _read_payload(reader: asyncio.StreamReader) -> str:
+    """Read a length-prefixed payload from the ADB server."""
+    length = int(await reader.readexactly(4), 16)
+    data = await reader.readexactly(length) if length else b""
+    return data.decode("utf-8", errors="ignore")
+
+
+class ADBServerClient:
+    """
+    Talks to the local ADB server over TCP instead of spawning `adb`.
+
+    The ADB server closes the socket after answering a host service,
+    so each query uses its own short-lived connection.
+
+    Args:
+        host: ADB server host.
+        port: ADB server port.
+        timeout: Timeout in seconds for a single query.
+    """
+
+    def __init__(
+        self,
+        host: str = ADB_SERVER_HOST,
+        port: int = ADB_SERVER_PORT,
+        timeout: float = 5.0,
+    ):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+
+    async def query(self, service: str, device_id: str | None = None) -> str:
+        """
+        Send a host service request and return the reply payload.
+
+        Args:
+            service: Service name without the host prefix (e.g. "get-state").
+            device_id: Optional device serial to target.
+
+        Returns:
+            Payload string returned by the server.
+
+        Raises:
+            OSError: If the ADB server is not reachable.
+            DeviceCommandError: If the server answers with FAIL.
+        """
+        return await asyncio.wait_for(
+            self._query(_host_service(service, device_id)), timeout=self.timeout
+        )
+
+    async def _query(self, request: str) -> str:
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            writer.write(_encode_request(request))
+            await writer.drain()
+
+            status = await reader.readexactly(4)
+            if status == b"OKAY":
+                return await _read_payload(reader)
+            if status == b"FAIL":
+                raise DeviceCommandError(await _read_payload(reader), request=request)
+            raise DeviceCommandError(f"Unexpected ADB reply: {status!r}", request=request)
+        finally:
+            writer.close()
+
+    async def get_state(self, device_id: str | None = None) -> str:
+        """Return the device state (e.g. "device", "offline")."""
+        return (await self.query("get-state", device_id)).strip()
+
+    async def reconnect(self, device_id: str | None = None) -> str:
+        """Ask the ADB server to reconnect the device."""
+        return (await self.query("reconnect", device_id)).strip()
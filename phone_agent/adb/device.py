@@ -11,6 +11,7 @@ if not hasattr(subprocess, 'CREATE_NO_WINDOW'):
     # 0x08000000 is CREATE_NO_WINDOW
     subprocess.CREATE_NO_WINDOW = 0x08000000 if os.name == 'nt' else 0
 
+from phone_agent.adb.shell import get_shell_session
 from phone_agent.config.apps import APP_PACKAGES
 
 
@@ -269,6 +270,24 @@ async def _async_run_adb(args: list, delay: float = 0.0) -> subprocess.Completed
     return proc
 
 
+async def _async_shell(cmd: list, device_id: str | None = None, delay: float = 0.0) -> None:
+    """
+    Run a device shell command over the persistent adb shell session.
+    
+    Like the one-off adb calls, a command that fails on the device is not
+    reported; a dropped session is simply restarted on the next call.
+    """
+    import asyncio
+    
+    try:
+        await get_shell_session(device_id).run(*cmd)
+    except ConnectionError:
+        pass
+    
+    if delay > 0:
+        await asyncio.sleep(delay)
+
+
 async def async_tap(x: int, y: int, device_id: str | None = None, delay: float = 1.0) -> None:
     """
     Tap at the specified coordinates asynchronously.
@@ -279,9 +298,7 @@ async def async_tap(x: int, y: int, device_id: str | None = None, delay: float =
         device_id: Optional ADB device ID.
         delay: Delay in seconds after tap.
     """
-    adb_prefix = _get_adb_prefix(device_id)
-    cmd = adb_prefix + ["shell", "input", "tap", str(x), str(y)]
-    await _async_run_adb(cmd, delay)
+    await _async_shell(["input", "tap", str(x), str(y)], device_id, delay)
 
 
 async def async_double_tap(
@@ -289,12 +306,11 @@ async def async_double_tap(
 ) -> None:
     """Double tap at the specified coordinates asynchronously."""
     import asyncio
-    adb_prefix = _get_adb_prefix(device_id)
-    cmd = adb_prefix + ["shell", "input", "tap", str(x), str(y)]
+    cmd = ["input", "tap", str(x), str(y)]
     
-    await _async_run_adb(cmd)
+    await _async_shell(cmd, device_id)
     await asyncio.sleep(0.1)
-    await _async_run_adb(cmd, delay)
+    await _async_shell(cmd, device_id, delay)
 
 
 async def async_long_press(
@@ -305,9 +321,8 @@ async def async_long_press(
     delay: float = 1.0,
 ) -> None:
     """Long press at the specified coordinates asynchronously."""
-    adb_prefix = _get_adb_prefix(device_id)
-    cmd = adb_prefix + ["shell", "input", "swipe", str(x), str(y), str(x), str(y), str(duration_ms)]
-    await _async_run_adb(cmd, delay)
+    cmd = ["input", "swipe", str(x), str(y), str(x), str(y), str(duration_ms)]
+    await _async_shell(cmd, device_id, delay)
 
 
 async def async_swipe(
@@ -320,32 +335,26 @@ async def async_swipe(
     delay: float = 1.0,
 ) -> None:
     """Swipe from start to end coordinates asynchronously."""
-    adb_prefix = _get_adb_prefix(device_id)
-    
     if duration_ms is None:
         dist_sq = (start_x - end_x) ** 2 + (start_y - end_y) ** 2
         duration_ms = int(dist_sq / 1000)
         duration_ms = max(1000, min(duration_ms, 2000))
     
-    cmd = adb_prefix + [
-        "shell", "input", "swipe",
+    cmd = [
+        "input", "swipe",
         str(start_x), str(start_y), str(end_x), str(end_y), str(duration_ms)
     ]
-    await _async_run_adb(cmd, delay)
+    await _async_shell(cmd, device_id, delay)
 
 
 async def async_back(device_id: str | None = None, delay: float = 1.0) -> None:
     """Press the back button asynchronously."""
-    adb_prefix = _get_adb_prefix(device_id)
-    cmd = adb_prefix + ["shell", "input", "keyevent", "4"]
-    await _async_run_adb(cmd, delay)
+    await _async_shell(["input", "keyevent", "4"], device_id, delay)
 
 
 async def async_home(device_id: str | None = None, delay: float = 1.0) -> None:
     """Press the home button asynchronously."""
-    adb_prefix = _get_adb_prefix(device_id)
-    cmd = adb_prefix + ["shell", "input", "keyevent", "KEYCODE_HOME"]
-    await _async_run_adb(cmd, delay)
+    await _async_shell(["input", "keyevent", "KEYCODE_HOME"], device_id, delay)
 
 
 async def async_launch_app(app_name: str, device_id: str | None = None, delay: float = 1.0) -> bool:
@@ -353,14 +362,13 @@ async def async_launch_app(app_name: str, device_id: str | None = None, delay: f
     if app_name not in APP_PACKAGES:
         return False
     
-    adb_prefix = _get_adb_prefix(device_id)
     package = APP_PACKAGES[app_name]
     
-    cmd = adb_prefix + [
-        "shell", "monkey", "-p", package,
+    cmd = [
+        "monkey", "-p", package,
         "-c", "android.intent.category.LAUNCHER", "1"
     ]
-    await _async_run_adb(cmd, delay)
+    await _async_shell(cmd, device_id, delay)
     return True
 
 
@@ -1,9 +1,14 @@
 """Input utilities for Android device text input."""
 
 import base64
+import shlex
 import subprocess
 from typing import Optional
 
+from phone_agent.adb.shell import get_shell_session
+
+ADB_KEYBOARD_IME = "com.android.adbkeyboard/.AdbIME"
+
 
 def type_text(text: str, device_id: str | None = None) -> None:
     """
@@ -191,3 +196,43 @@ async def async_input_keyevent(keycode: str | int, device_id: str | None = None)
     adb_prefix = _get_adb_prefix(device_id)
     await _async_run_adb(adb_prefix + ["shell", "input", "keyevent", str(keycode)])
 
+
+async def async_run_shell_chain(cmds: list[str], device_id: str | None = None) -> None:
+    """
+    Run several device shell commands as one `&&` chain.
+    
+    The chain goes through the persistent adb shell session, so the whole
+    sequence costs one round-trip instead of one `adb` process per command.
+    A later command only runs if the previous one succeeded.
+    
+    Args:
+        cmds: Shell command strings, already quoted for the device shell.
+        device_id: Optional ADB device ID.
+    """
+    try:
+        await get_shell_session(device_id).run("sh", "-c", " && ".join(cmds))
+    except ConnectionError:
+        pass
+
+
+async def async_send_text(text: str, enter: bool = True, device_id: str | None = None) -> None:
+    """
+    Switch to ADB Keyboard, type text and optionally press ENTER in one shell call.
+    
+    Unlike async_detect_and_set_adb_keyboard, the current IME is not read
+    back, so there is nothing to restore afterwards.
+    
+    Args:
+        text: The text to type.
+        enter: Whether to send KEYCODE_ENTER after the text.
+        device_id: Optional ADB device ID.
+    """
+    encoded_text = base64.b64encode(text.encode("utf-8")).decode("utf-8")
+    cmds = [
+        f"ime set {ADB_KEYBOARD_IME}",
+        "am broadcast -a ADB_INPUT_B64 --es msg ''",  # Warm up the keyboard
+        f"am broadcast -a ADB_INPUT_B64 --es msg {shlex.quote(encoded_text)}",
+    ]
+    if enter:
+        cmds.append("input keyevent 66")  # KEYCODE_ENTER
+    await async_run_shell_chain(cmds, device_id)
@@ -0,0 +1,125 @@
+"""Persistent `adb shell` sessions for async device commands."""
+
+import asyncio
+import os
+import shlex
+import subprocess
+
+# Printed after every command so we know when it has finished
+_SENTINEL = b"__autoglm_done__"
+
+
+class AdbShellSession:
+    """
+    One long-lived `adb shell` process that runs commands fed over stdin.
+
+    Each command is followed by an `echo` of a sentinel line, and run()
+    waits for that line, so commands still complete one at a time and in
+    order, but without a fork+exec of `adb` per command.
+
+    If a command is cancelled or times out, its sentinel may still be on
+    its way, so the session is killed and the next call starts a fresh one
+    rather than mistaking that sentinel for its own.
+
+    Args:
+        device_id: Optional ADB device ID.
+        timeout: Seconds to wait for a single command to finish.
+    """
+
+    def __init__(self, device_id: str | None = None, timeout: float = 30.0):
+        self.device_id = device_id
+        self.timeout = timeout
+        self._proc: asyncio.subprocess.Process | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._lock: asyncio.Lock | None = None
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the shell process is alive on the current event loop."""
+        return (
+            self._proc is not None
+            and self._proc.returncode is None
+            and self._loop is asyncio.get_running_loop()
+        )
+
+    async def _start(self) -> None:
+        args = ["adb", "-s", self.device_id, "shell"] if self.device_id else ["adb", "shell"]
+        self._proc = await asyncio.create_subprocess_exec(
+            *args,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
+        )
+
+    async def run(self, *cmd: str) -> None:
+        """
+        Run a shell command on the device and wait for it to finish.
+
+        Args:
+            *cmd: Command and arguments (quoted for the device shell).
+
+        Raises:
+            OSError: If the shell cannot be started or exits before the
+                command completes.
+            TimeoutError: If the command does not finish within `timeout`.
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Subprocess transports and locks are bound to the loop that made them
+            self._kill()
+            self._loop = loop
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            if not self.is_running:
+                await self._start()
+
+            proc = self._proc
+            proc.stdin.write(f"{shlex.join(cmd)}; echo {_SENTINEL.decode()}\n".encode("utf-8"))
+            try:
+                await asyncio.wait_for(self._wait_for_sentinel(proc), self.timeout)
+            except (OSError, asyncio.TimeoutError, asyncio.CancelledError):
+                # Drop the session so a stale sentinel can't answer the next call
+                self._kill()
+                raise
+
+    @staticmethod
+    async def _wait_for_sentinel(proc: asyncio.subprocess.Process) -> None:
+        await proc.stdin.drain()
+        while True:
+            line = await proc.stdout.readline()
+            if not line:
+                raise ConnectionError("adb shell session closed")
+            if line.rstrip() == _SENTINEL:
+                return
+
+    def _kill(self) -> None:
+        """Kill and forget the shell process, if any."""
+        proc, self._proc = self._proc, None
+        if proc is not None and proc.returncode is None:
+            try:
+                proc.kill()
+            except ProcessLookupError:
+                pass  # Already gone, or its transport was closed with its loop
+
+    async def close(self) -> None:
+        """Terminate the shell process."""
+        proc, self._proc = self._proc, None
+        if proc is not None and proc.returncode is None:
+            proc.stdin.close()
+            try:
+                await asyncio.wait_for(proc.wait(), timeout=2.0)
+            except asyncio.TimeoutError:
+                proc.kill()
+
+
+_sessions: dict[str | None, AdbShellSession] = {}
+
+
+def get_shell_session(device_id: str | None = None) -> AdbShellSession:
+    """Get the shared shell session for a device, creating it if needed."""
+    session = _sessions.get(device_id)
+    if session is None:
+        session = _sessions[device_id] = AdbShellSession(device_id)
+    return session
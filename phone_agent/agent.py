@@ -225,11 +225,17 @@ class PhoneAgent:
 
         Returns:
             StepResult with step details.
+
+        Raises:
+            TaskCancelledException: If agent_config.max_steps steps have
+                already run since the last reset.
         """
         is_first = len(self._context) == 0
 
         if is_first and not task:
             raise ValueError("Task is required for the first step")
+        if self._step_count >= self.agent_config.max_steps:
+            raise TaskCancelledException("Max steps reached")
 
         return self._execute_step(task, is_first)
 
@@ -551,11 +557,17 @@ class AsyncPhoneAgent:
 
         Returns:
             StepResult with step details.
+
+        Raises:
+            TaskCancelledException: If agent_config.max_steps steps have
+                already run since the last reset.
         """
         is_first = len(self._context) == 0
 
         if is_first and not task:
             raise ValueError("Task is required for the first step")
+        if self._step_count >= self.agent_config.max_steps:
+            raise TaskCancelledException("Max steps reached")
 
         return await self._execute_step(task, is_first)
 
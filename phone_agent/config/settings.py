@@ -77,6 +77,7 @@ class WebSettings:
     debug: bool = False
     auto_open_browser: bool = True
     stream_fps: int = 10
+    stream_raw: bool = True  # Stream raw framebuffer instead of PNG (less CPU, more bandwidth)
 
 
 @dataclass  
@@ -258,6 +259,7 @@ class Settings:
                 "debug": self.web.debug,
                 "auto_open_browser": self.web.auto_open_browser,
                 "stream_fps": self.web.stream_fps,
+                "stream_raw": self.web.stream_raw,
             },
             "log": {
                 "level": self.log.level,
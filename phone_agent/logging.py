@@ -14,12 +14,16 @@ Usage:
     logger.result("任务完成")
 """
 
+import atexit
 import json
+import os
+import queue
 import sys
+import threading
 import time
 from enum import Enum
 from typing import Any, Optional
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 
 
 class LogLevel(Enum):
@@ -31,7 +35,7 @@ class LogLevel(Enum):
     AGENT = "AGENT"  # Special level for agent activities
 
 
-@dataclass
+@dataclass(slots=True)
 class LogEntry:
     """Structured log entry."""
     ts: float           # Unix timestamp
@@ -43,7 +47,11 @@ class LogEntry:
     
     def to_json(self) -> str:
         """Convert to JSON string, omitting None fields."""
-        data = {k: v for k, v in asdict(self).items() if v is not None}
+        data = {"ts": self.ts, "module": self.module, "level": self.level, "msg": self.msg}
+        if self.tag is not None:
+            data["tag"] = self.tag
+        if self.details is not None:
+            data["details"] = self.details
         return json.dumps(data, ensure_ascii=False)
     
     def to_console(self) -> str:
@@ -77,6 +85,140 @@ class LogEntry:
             return f"{color}[{timestamp}] [{self.level}] [{self.module}] {self.msg}{reset}"
 
 
+def _console_supports_rich_output() -> bool:
+    """
+    Check once whether stdout can render ANSI colors and emoji.
+    
+    Honors the NO_COLOR convention and falls back to plain JSON lines for
+    non-terminals or encodings that cannot represent the emoji markers.
+    """
+    if "NO_COLOR" in os.environ:
+        return False
+    stream = sys.stdout
+    try:
+        if not stream.isatty():
+            return False
+        "💭🎯✅❌".encode(stream.encoding or "ascii")
+    except Exception:
+        return False
+    return True
+
+
+def _flush_stdout() -> None:
+    try:
+        sys.__stdout__.flush()
+    except Exception:
+        pass
+
+
+class _ConsoleWriter:
+    """
+    Background writer for the real process stdout.
+    
+    Used by write_stdout() while sys.stdout is redirected, so everything
+    printed goes through the same queue. Lines are rendered to bytes by the
+    caller and queued; a daemon thread drains everything pending and emits
+    it with a single os.write() per burst instead of one flush per line.
+    sys.stdout's own buffer is flushed before a line is queued so plain
+    print() output stays ahead of the burst that follows it, and at exit
+    the thread is told to stop and joined so a burst it already dequeued
+    is not lost.
+    """
+    
+    _STOP = None  # Queued at exit to end the drain thread
+    
+    def __init__(self):
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._fd: Optional[int] = None
+        self._encoding = "utf-8"
+    
+    def write(self, line: str, end: str = "\n") -> bool:
+        """Queue a line for output. Returns False if stdout has no usable fd."""
+        if self._thread is None and not self._start():
+            return False
+        # Push out what print() has buffered so far on the calling thread
+        # (flushing from the drain thread could split a print() mid-line),
+        # so every queued burst lands after the output that preceded it
+        _flush_stdout()
+        self._queue.put((line + end).encode(self._encoding, errors="replace"))
+        return True
+    
+    def _start(self) -> bool:
+        with self._lock:
+            if self._thread is not None:
+                return True
+            try:
+                self._fd = sys.__stdout__.fileno()
+            except Exception:
+                return False
+            self._encoding = getattr(sys.__stdout__, "encoding", None) or "utf-8"
+            self._thread = threading.Thread(target=self._drain, name="log-writer", daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+            return True
+    
+    def _drain(self) -> None:
+        q = self._queue
+        while True:
+            chunks = [q.get()]
+            self._collect(chunks)
+            if self._STOP in chunks:
+                self._write_all(b"".join(c for c in chunks if c is not self._STOP))
+                return
+            self._write_all(b"".join(chunks))
+    
+    def _collect(self, chunks: list) -> None:
+        """Append every chunk already queued without blocking."""
+        q = self._queue
+        while True:
+            try:
+                chunks.append(q.get_nowait())
+            except queue.Empty:
+                return
+    
+    def _write_all(self, buf: bytes) -> None:
+        if not buf:
+            return
+        view = memoryview(buf)
+        while view:
+            try:
+                written = os.write(self._fd, view)
+            except OSError:
+                return
+            view = view[written:]
+    
+    def flush(self) -> None:
+        """Synchronously write out anything still queued."""
+        chunks: list = []
+        self._collect(chunks)
+        self._write_all(b"".join(c for c in chunks if c is not self._STOP))
+    
+    def close(self, timeout: float = 2.0) -> None:
+        """Stop the drain thread after it writes out everything queued (used at exit)."""
+        thread = self._thread
+        if thread is not None and thread.is_alive():
+            self._queue.put(self._STOP)
+            thread.join(timeout)
+        self.flush()
+
+
+_console_writer = _ConsoleWriter()
+
+
+def write_stdout(text: str) -> None:
+    """
+    Write raw text to the real process stdout through the background writer.
+    
+    For stdout interceptors (e.g. the web console) that must still echo
+    what they capture; falls back to a direct write if stdout has no fd.
+    """
+    if not _console_writer.write(text, end=""):
+        sys.__stdout__.write(text)
+        sys.__stdout__.flush()
+
+
 class StructuredLogger:
     """
     Structured logger with JSON output.
@@ -110,6 +252,8 @@ class StructuredLogger:
         self.module = module
         self.queue = queue
         self.min_level = min_level
+        # Choose the console formatter once instead of guarding every write
+        self._format = LogEntry.to_console if _console_supports_rich_output() else LogEntry.to_json
     
     def _should_log(self, level: LogLevel) -> bool:
         """Check if level meets minimum threshold."""
@@ -119,6 +263,7 @@ class StructuredLogger:
         self, 
         level: LogLevel, 
         msg: str, 
+        *args: Any,
         tag: Optional[str] = None,
         **extra
     ) -> None:
@@ -127,12 +272,15 @@ class StructuredLogger:
         
         Args:
             level: Log level
-            msg: Log message
+            msg: Log message, %-formatted with args only if the level is enabled
+            *args: Lazy format arguments for msg
             tag: Optional semantic tag
             **extra: Additional fields to include
         """
         if not self._should_log(level):
             return
+        if args:
+            msg = msg % args
         
         entry = LogEntry(
             ts=time.time(),
@@ -146,12 +294,10 @@ class StructuredLogger:
         # Output to terminal
         # Skip console output for high-frequency STREAM tags to avoid clutter
         if tag != "STREAM":
-            try:
-                print(entry.to_console())
-            except Exception:
-                # Fallback if color codes fail
-                sys.__stdout__.write(entry.to_json() + "\n")
-                sys.__stdout__.flush()
+            # Written synchronously so it stays in order with plain print()
+            # calls; the web console's stdout interceptor batches its echo
+            # through the background writer instead
+            print(self._format(entry))
         
         # Output to queue (for web frontend)
         if self.queue:
@@ -162,21 +308,23 @@ class StructuredLogger:
     
     # ========== Standard Levels ==========
     
-    def debug(self, msg: str, **extra) -> None:
+    def debug(self, msg: str, *args: Any, **extra) -> None:
         """Log debug message."""
-        self.log(LogLevel.DEBUG, msg, **extra)
+        self.log(LogLevel.DEBUG, msg, *args, **extra)
     
-    def info(self, msg: str, **extra) -> None:
+    def info(self, msg: str, *args: Any, **extra) -> None:
         """Log info message."""
-        self.log(LogLevel.INFO, msg, **extra)
+        self.log(LogLevel.INFO, msg, *args, **extra)
     
-    def warn(self, msg: str, **extra) -> None:
+    def warn(self, msg: str, *args: Any, **extra) -> None:
         """Log warning message."""
-        self.log(LogLevel.WARN, msg, **extra)
+        self.log(LogLevel.WARN, msg, *args, **extra)
+    
+    warning = warn
     
-    def error(self, msg: str, **extra) -> None:
+    def error(self, msg: str, *args: Any, **extra) -> None:
         """Log error message."""
-        self.log(LogLevel.ERROR, msg, **extra)
+        self.log(LogLevel.ERROR, msg, *args, **extra)
     
     # ========== Agent-Specific Methods ==========
     
@@ -1,10 +1,14 @@
 """Model client for AI inference using OpenAI-compatible or Anthropic API."""
 
+import asyncio
 import json
 import os
+import re
+import time
 from dataclasses import dataclass, field
 from typing import Any
 
+import httpx
 from openai import OpenAI
 try:
     from anthropic import Anthropic
@@ -12,11 +16,36 @@ try:
 except ImportError:
     ANTHROPIC_AVAILABLE = False
 
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+from phone_agent.config.settings import get_settings
 from phone_agent.logging import get_logger
+from phone_agent.retry import RetryConfig, calculate_delay
 
 # Module logger
 logger = get_logger("model")
 
+# Action markers recognised by _parse_response, matched in a single scan
+_FINISH_MARKER = "finish(message="
+_DO_MARKER = "do(action="
+_ANSWER_MARKER = "<answer>"
+_ACTION_MARKERS = re.compile(r"finish\(message=|do\(action=|<answer>")
+
+# Screenshot payload settings for user messages
+_JPEG_MAGIC = b"\xff\xd8\xff"
+_IMG_MAX_DIM = 1024
+_IMG_QUALITY = int(os.environ.get("AUTOGLM_IMG_QUALITY", "85"))
+
+# Backoff between model request retries
+_RETRY_CFG = RetryConfig(max_attempts=3, base_delay=0.5)
+
+# Floor for the read timeout: long generations stream nothing until done (matches the SDK default)
+_READ_TIMEOUT = 600.0
+
 
 @dataclass
 class ModelConfig:
@@ -32,6 +61,17 @@ class ModelConfig:
     extra_body: dict[str, Any] = field(default_factory=dict)
 
 
+def _build_http_client() -> httpx.Client:
+    """Build a keep-alive HTTP client shared by all requests of one ModelClient."""
+    timeout = float(get_settings().model.timeout)
+    return httpx.Client(
+        http2=HTTP2_AVAILABLE,
+        timeout=httpx.Timeout(timeout, connect=10.0, read=max(timeout, _READ_TIMEOUT)),
+        limits=httpx.Limits(max_keepalive_connections=16, max_connections=32),
+        follow_redirects=True,  # As the SDK's own default client does
+    )
+
+
 @dataclass
 class ModelResponse:
     """Response from the AI model."""
@@ -52,6 +92,7 @@ class ModelClient:
     def __init__(self, config: ModelConfig | None = None):
         self.config = config or ModelConfig()
         self.is_anthropic = "claude" in self.config.model_name.lower()
+        self._http_client: httpx.Client | None = None
         
         if self.is_anthropic:
             if not ANTHROPIC_AVAILABLE:
@@ -68,12 +109,38 @@ class ModelClient:
             # Simple heuristic: If it ends in /v1, remove it for Anthropic SDK if the SDK adds it?
             # actually Anthropic SDK default is https://api.anthropic.com
             
+            self._http_client = _build_http_client()
             self.anthropic_client = Anthropic(
                 base_url=self.config.base_url.replace("/v1", ""), # Attempt to strip /v1 for SDK
-                api_key=self.config.api_key
+                api_key=self.config.api_key,
+                http_client=self._http_client,
             )
         else:
-            self.client = OpenAI(base_url=self.config.base_url, api_key=self.config.api_key)
+            # Reuse one pooled connection across agent steps (no TLS handshake per call)
+            self._http_client = _build_http_client()
+            self.client = OpenAI(
+                base_url=self.config.base_url,
+                api_key=self.config.api_key,
+                http_client=self._http_client,
+            )
+
+    def close(self) -> None:
+        """Close the underlying HTTP connection pool."""
+        if self._http_client is not None:
+            self._http_client.close()
+            self._http_client = None
+
+    def __enter__(self) -> "ModelClient":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
 
     def request(self, messages: list[dict[str, Any]]) -> ModelResponse:
         """
@@ -88,7 +155,7 @@ class ModelClient:
         Raises:
             ValueError: If the response cannot be parsed.
         """
-        max_retries = 3
+        max_retries = _RETRY_CFG.max_attempts
         raw_content = ""
 
         for attempt in range(max_retries):
@@ -111,16 +178,14 @@ class ModelClient:
                 
                 logger.warn("Model returned empty content", attempt=attempt+1, max_retries=max_retries, finish_reason=response.choices[0].finish_reason)
                 if attempt < max_retries - 1:
-                    import time
-                    time.sleep(1.0) # Wait a bit before retry
+                    time.sleep(calculate_delay(attempt, _RETRY_CFG)) # Back off before retry
                     
             except Exception as e:
                 logger.error("API call failed", attempt=attempt+1, max_retries=max_retries, error=str(e))
                 if attempt == max_retries - 1:
                     raw_content = "" # Ensure it's empty string if failed
                 else:
-                    import time
-                    time.sleep(1.0)
+                    time.sleep(calculate_delay(attempt, _RETRY_CFG))
         
         if not raw_content:
              raw_content = ""
@@ -150,9 +215,13 @@ class ModelClient:
                         elif item["type"] == "image_url":
                             # Parse data url
                             data_url = item["image_url"]["url"]
-                            if data_url.startswith("data:"):
-                                header, data = data_url.split(",", 1)
-                                media_type = header.split(";")[0].split(":")[1]
+                            # Slice by offsets instead of split() to avoid
+                            # extra copies of the (multi-MB) base64 payload
+                            comma = data_url.find(",")
+                            if data_url.startswith("data:") and comma != -1:
+                                data = data_url[comma + 1:]
+                                type_end = data_url.find(";", 5, comma)
+                                media_type = data_url[5:type_end if type_end != -1 else comma]
                                 new_content.append({
                                     "type": "image", 
                                     "source": {
@@ -197,10 +266,46 @@ class ModelClient:
         if not content:
             return "", ""
 
-        # Attempt JSON parsing first
+        # Attempt JSON parsing first (only when it can actually be JSON)
+        clean_content = content.strip()
+        if clean_content[:1] in ("{", "`"):
+            parsed = self._parse_json_response(clean_content)
+            if parsed is not None:
+                return parsed
+        
+        # Legacy Parsing Logic below (Fallback)
+        
+        # Locate the first occurrence of every marker in one pass
+        positions: dict[str, int] = {}
+        for match in _ACTION_MARKERS.finditer(content):
+            positions.setdefault(match.group(), match.start())
+
+        # Rule 1: Check for finish(message=
+        # The action keeps its marker, so it is simply the suffix from it on
+        if _FINISH_MARKER in positions:
+            i = positions[_FINISH_MARKER]
+            return content[:i].strip(), content[i:]
+
+        # Rule 2: Check for do(action=
+        if _DO_MARKER in positions:
+            i = positions[_DO_MARKER]
+            return content[:i].strip(), content[i:]
+
+        # Rule 3: Fallback to legacy XML tag parsing
+        if _ANSWER_MARKER in positions:
+            i = positions[_ANSWER_MARKER]
+            thinking = content[:i].replace("<think>", "").replace("</think>", "").strip()
+            action = content[i + len(_ANSWER_MARKER):].replace("</answer>", "").strip()
+            return thinking, action
+
+        # Rule 4: No markers found, return content as action
+        return "", content
+
+    @staticmethod
+    def _parse_json_response(clean_content: str) -> tuple[str, str] | None:
+        """Parse a JSON-formatted response, returning None if it is not one."""
         try:
             # Handle potential markdown code blocks
-            clean_content = content.strip()
             if clean_content.startswith("```json"):
                 clean_content = clean_content[7:]
             if clean_content.startswith("```"):
@@ -221,32 +326,7 @@ class ModelClient:
                     return str(thinking), str(action)
         except json.JSONDecodeError:
             pass
-        
-        # Legacy Parsing Logic below (Fallback)
-
-        # Rule 1: Check for finish(message=
-        if "finish(message=" in content:
-            parts = content.split("finish(message=", 1)
-            thinking = parts[0].strip()
-            action = "finish(message=" + parts[1]
-            return thinking, action
-
-        # Rule 2: Check for do(action=
-        if "do(action=" in content:
-            parts = content.split("do(action=", 1)
-            thinking = parts[0].strip()
-            action = "do(action=" + parts[1]
-            return thinking, action
-
-        # Rule 3: Fallback to legacy XML tag parsing
-        if "<answer>" in content:
-            parts = content.split("<answer>", 1)
-            thinking = parts[0].replace("<think>", "").replace("</think>", "").strip()
-            action = parts[1].replace("</answer>", "").strip()
-            return thinking, action
-
-        # Rule 4: No markers found, return content as action
-        return "", content
+        return None
 
 
 class MessageBuilder:
@@ -280,22 +360,26 @@ class MessageBuilder:
                 import io
                 import base64
                 
-                # Decode
+                # Decode (Image.open only parses the header here)
                 img_data = base64.b64decode(image_base64)
                 img = Image.open(io.BytesIO(img_data))
                 
                 # Resize if needed (max 1024px on long side)
-                max_dim = 1024
-                if max(img.width, img.height) > max_dim:
-                    scale = max_dim / max(img.width, img.height)
-                    new_size = (int(img.width * scale), int(img.height * scale))
-                    img = img.resize(new_size, Image.Resampling.LANCZOS)
+                needs_resize = max(img.width, img.height) > _IMG_MAX_DIM
+                
+                # Small JPEGs are sent as-is; everything else is encoded to JPEG once
+                if needs_resize or img_data[:3] != _JPEG_MAGIC:
+                    if needs_resize:
+                        scale = _IMG_MAX_DIM / max(img.width, img.height)
+                        new_size = (int(img.width * scale), int(img.height * scale))
+                        img = img.resize(new_size, Image.Resampling.LANCZOS)
+                    if img.mode not in ("RGB", "L"):
+                        img = img.convert("RGB")  # JPEG has no alpha channel
                     
                     # Re-encode
                     buf = io.BytesIO()
-                    img.save(buf, format="JPEG", quality=85) # Use JPEG for smaller size
+                    img.save(buf, format="JPEG", quality=_IMG_QUALITY) # Use JPEG for smaller size
                     image_base64 = base64.b64encode(buf.getvalue()).decode('utf-8')
-                    # print(f"[DEBUG] Resized image to {new_size}")
             except Exception as e:
                 # If PIL missing or fail, fallback to original
                 logger.warn("Failed to resize image", error=str(e))
@@ -349,10 +433,17 @@ class AsyncModelClient:
     
     Args:
         config: Model configuration.
+        http_client: Optional shared httpx.AsyncClient. If not given, each
+            request opens (and closes) its own client.
     """
     
-    def __init__(self, config: ModelConfig | None = None):
+    def __init__(
+        self,
+        config: ModelConfig | None = None,
+        http_client: httpx.AsyncClient | None = None,
+    ):
         self.config = config or ModelConfig()
+        self._http_client = http_client
         self._parse_response = ModelClient._parse_response  # Reuse sync parser
         
     async def request(self, messages: list[dict[str, Any]]) -> ModelResponse:
@@ -365,10 +456,7 @@ class AsyncModelClient:
         Returns:
             ModelResponse containing thinking and action.
         """
-        import httpx
-        from phone_agent.logging import LogLevel
-        
-        max_retries = 3
+        max_retries = _RETRY_CFG.max_attempts
         raw_content = ""
         
         headers = {
@@ -389,54 +477,26 @@ class AsyncModelClient:
         
         for attempt in range(max_retries):
             try:
-                # Use longer timeout for streaming
-                async with httpx.AsyncClient(timeout=300.0) as client:
-                    async with client.stream(
-                        "POST",
-                        f"{self.config.base_url}/chat/completions",
-                        headers=headers,
-                        json=payload
-                    ) as response:
-                        response.raise_for_status()
-                        
-                        # Process SSE stream
-                        async for line in response.aiter_lines():
-                            if not line.startswith("data: "):
-                                continue
-                                
-                            data_str = line[6:]  # Strip "data: "
-                            if data_str == "[DONE]":
-                                break
-                                
-                            try:
-                                chunk = json.loads(data_str)
-                                delta = chunk["choices"][0].get("delta", {})
-                                content = delta.get("content", "")
-                                
-                                if content:
-                                    raw_content += content
-                                    # Log chunk for real-time UI updates
-                                    # We use a special "STREAM" tag that the frontend handles specially
-                                    logger.log(LogLevel.INFO, content, tag="STREAM")
-                                    
-                            except json.JSONDecodeError:
-                                pass
-                                
-                    if raw_content and raw_content.strip():
-                        break
-                    
-                    logger.warn("Model returned empty content", attempt=attempt+1)
-                    if attempt < max_retries - 1:
-                        import asyncio
-                        await asyncio.sleep(1.0)
+                if self._http_client is not None:
+                    raw_content = await self._stream_completion(self._http_client, headers, payload)
+                else:
+                    # Use longer timeout for streaming
+                    async with httpx.AsyncClient(timeout=300.0) as client:
+                        raw_content = await self._stream_completion(client, headers, payload)
+                
+                if raw_content and raw_content.strip():
+                    break
+                
+                logger.warn("Model returned empty content", attempt=attempt+1)
+                if attempt < max_retries - 1:
+                    await asyncio.sleep(calculate_delay(attempt, _RETRY_CFG))
                         
             except Exception as e:
                 logger.error("Async API call failed", attempt=attempt+1, error=str(e))
                 if attempt == max_retries - 1:
                     raw_content = ""
                 else:
-                    import asyncio
-                    await asyncio.sleep(1.0)
+                    await asyncio.sleep(calculate_delay(attempt, _RETRY_CFG))
         
         if not raw_content:
             raw_content = ""
@@ -446,4 +506,44 @@ class AsyncModelClient:
         sync_client.config = self.config
         thinking, action = sync_client._parse_response(raw_content)
         return ModelResponse(thinking=thinking, action=action, raw_content=raw_content)
+    
+    async def _stream_completion(
+        self, client: httpx.AsyncClient, headers: dict[str, str], payload: dict[str, Any]
+    ) -> str:
+        """Send one streaming chat completion request and collect its content."""
+        from phone_agent.logging import LogLevel
+        
+        raw_content = ""
+        async with client.stream(
+            "POST",
+            f"{self.config.base_url}/chat/completions",
+            headers=headers,
+            json=payload
+        ) as response:
+            response.raise_for_status()
+            
+            # Process SSE stream
+            async for line in response.aiter_lines():
+                if not line.startswith("data: "):
+                    continue
+                    
+                data_str = line[6:]  # Strip "data: "
+                if data_str == "[DONE]":
+                    break
+                    
+                try:
+                    chunk = json.loads(data_str)
+                    delta = chunk["choices"][0].get("delta", {})
+                    content = delta.get("content", "")
+                    
+                    if content:
+                        raw_content += content
+                        # Log chunk for real-time UI updates
+                        # We use a special "STREAM" tag that the frontend handles specially
+                        logger.log(LogLevel.INFO, content, tag="STREAM")
+                        
+                except json.JSONDecodeError:
+                    pass
+        
+        return raw_content
 
@@ -9,10 +9,14 @@ This module provides decorators and utilities for:
 
 import asyncio
 import functools
+import itertools
+import random
+import threading
 import time
 from typing import Any, Callable, TypeVar, Optional
 from dataclasses import dataclass
 
+from phone_agent.adb.adb_client import ADBServerClient
 from phone_agent.exceptions import (
     AutoGLMError,
     DeviceDisconnectedError,
@@ -27,6 +31,17 @@ logger = get_logger("retry")
 
 T = TypeVar("T")
 
+# Module-level RNG for jitter (avoids the global random state lookups)
+_rng = random.Random()
+
+# Common retryable error types, checked by exact type before isinstance()
+_RETRYABLE = frozenset([
+    ModelRateLimitError,
+    ModelTimeoutError,
+    ModelConnectionError,
+    DeviceDisconnectedError,
+])
+
 
 @dataclass
 class RetryConfig:
@@ -49,19 +64,35 @@ def calculate_delay(attempt: int, config: RetryConfig) -> float:
     Returns:
         Delay in seconds
     """
-    import random
-    
     delay = config.base_delay * (config.exponential_base ** attempt)
     delay = min(delay, config.max_delay)
     
     if config.jitter:
         # Add ±25% jitter to prevent thundering herd
-        jitter_factor = 0.75 + random.random() * 0.5
+        jitter_factor = 0.75 + _rng.random() * 0.5
         delay *= jitter_factor
     
     return delay
 
 
+def _delay_schedule(config: RetryConfig) -> tuple[float, ...]:
+    """
+    Precompute the un-jittered backoff delay for every retry.
+    
+    Jitter is still applied per attempt by the caller.
+    
+    Args:
+        config: Retry configuration
+        
+    Returns:
+        Tuple of delays indexed by attempt number (0-indexed)
+    """
+    return tuple(
+        min(config.base_delay * (config.exponential_base ** attempt), config.max_delay)
+        for attempt in range(max(config.max_attempts - 1, 0))
+    )
+
+
 def retry_sync(
     max_attempts: int = 3,
     base_delay: float = 1.0,
@@ -76,26 +107,34 @@ def retry_sync(
         retryable_exceptions: Tuple of exception types to retry
     """
     config = RetryConfig(max_attempts=max_attempts, base_delay=base_delay)
+    # Bind hot values once so the retry loop only touches locals
+    delays = _delay_schedule(config)
+    jitter = config.jitter
+    attempts = config.max_attempts
+    last_attempt = attempts - 1
     
     def decorator(func: Callable[..., T]) -> Callable[..., T]:
         @functools.wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> T:
             last_exception = None
             
-            for attempt in range(config.max_attempts):
+            for attempt in range(attempts):
                 try:
                     return func(*args, **kwargs)
                 except retryable_exceptions as e:
                     last_exception = e
                     
                     # Check if error is marked as non-retryable
-                    if isinstance(e, AutoGLMError) and not e.retryable:
+                    if type(e) not in _RETRYABLE and isinstance(e, AutoGLMError) and not e.retryable:
                         raise
                     
-                    if attempt < config.max_attempts - 1:
-                        delay = calculate_delay(attempt, config)
+                    if attempt < last_attempt:
+                        delay = delays[attempt]
+                        if jitter:
+                            # Add ±25% jitter to prevent thundering herd
+                            delay *= 0.75 + _rng.random() * 0.5
                         logger.warn(
-                            f"Retry attempt {attempt + 1}/{config.max_attempts}",
+                            f"Retry attempt {attempt + 1}/{attempts}",
                             error=str(e),
                             delay=f"{delay:.1f}s"
                         )
@@ -120,31 +159,38 @@ def retry_async(
         retryable_exceptions: Tuple of exception types to retry
     """
     config = RetryConfig(max_attempts=max_attempts, base_delay=base_delay)
+    # Bind hot values once so the retry loop only touches locals
+    delays = _delay_schedule(config)
+    jitter = config.jitter
+    attempts = config.max_attempts
+    last_attempt = attempts - 1
     
     def decorator(func: Callable[..., T]) -> Callable[..., T]:
         @functools.wraps(func)
         async def wrapper(*args: Any, **kwargs: Any) -> T:
             last_exception = None
             
-            for attempt in range(config.max_attempts):
+            for attempt in range(attempts):
                 try:
                     return await func(*args, **kwargs)
                 except retryable_exceptions as e:
                     last_exception = e
                     
                     # Check if error is marked as non-retryable
-                    if isinstance(e, AutoGLMError) and not e.retryable:
+                    if type(e) not in _RETRYABLE and isinstance(e, AutoGLMError) and not e.retryable:
                         raise
                     
-                    # Special handling for rate limit
-                    if isinstance(e, ModelRateLimitError):
-                        delay = e.retry_after
-                    else:
-                        delay = calculate_delay(attempt, config)
-                    
-                    if attempt < config.max_attempts - 1:
+                    if attempt < last_attempt:
+                        # Special handling for rate limit
+                        if isinstance(e, ModelRateLimitError):
+                            delay = e.retry_after
+                        else:
+                            delay = delays[attempt]
+                            if jitter:
+                                # Add ±25% jitter to prevent thundering herd
+                                delay *= 0.75 + _rng.random() * 0.5
                         logger.warn(
-                            f"Retry attempt {attempt + 1}/{config.max_attempts}",
+                            f"Retry attempt {attempt + 1}/{attempts}",
                             error=str(e),
                             delay=f"{delay:.1f}s"
                         )
@@ -180,24 +226,33 @@ class ADBConnectionManager:
         self.max_reconnect_attempts = max_reconnect_attempts
         self.reconnect_delay = reconnect_delay
         self._connected = False
+        self._adb = ADBServerClient()
     
     async def check_connection(self) -> bool:
         """Check if ADB connection is alive."""
         try:
-            proc = await asyncio.create_subprocess_exec(
-                "adb", *([] if not self.device_id else ["-s", self.device_id]),
-                "get-state",
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=5.0)
-            state = stdout.decode().strip()
+            try:
+                state = await self._adb.get_state(self.device_id)
+            except OSError:
+                # ADB server not reachable; the CLI will start it for us
+                state = await self._get_state_subprocess()
             self._connected = state == "device"
             return self._connected
         except Exception:
             self._connected = False
             return False
     
+    async def _get_state_subprocess(self) -> str:
+        """Query device state by spawning `adb get-state`."""
+        proc = await asyncio.create_subprocess_exec(
+            "adb", *([] if not self.device_id else ["-s", self.device_id]),
+            "get-state",
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=5.0)
+        return stdout.decode().strip()
+    
     async def reconnect(self) -> bool:
         """
         Attempt to reconnect to the device.
@@ -210,13 +265,16 @@ class ADBConnectionManager:
         for attempt in range(self.max_reconnect_attempts):
             try:
                 # First try adb reconnect
-                proc = await asyncio.create_subprocess_exec(
-                    "adb", *([] if not self.device_id else ["-s", self.device_id]),
-                    "reconnect",
-                    stdout=asyncio.subprocess.DEVNULL,
-                    stderr=asyncio.subprocess.DEVNULL,
-                )
-                await proc.wait()
+                try:
+                    await self._adb.reconnect(self.device_id)
+                except OSError:
+                    proc = await asyncio.create_subprocess_exec(
+                        "adb", *([] if not self.device_id else ["-s", self.device_id]),
+                        "reconnect",
+                        stdout=asyncio.subprocess.DEVNULL,
+                        stderr=asyncio.subprocess.DEVNULL,
+                    )
+                    await proc.wait()
                 
                 # Wait for device to come back
                 await asyncio.sleep(self.reconnect_delay)
@@ -301,7 +359,7 @@ async def with_retry(
         except Exception as e:
             last_exception = e
             
-            if not is_retryable(e) and isinstance(e, AutoGLMError):
+            if type(e) not in _RETRYABLE and not is_retryable(e) and isinstance(e, AutoGLMError):
                 raise
             
             if attempt < max_attempts - 1:
@@ -330,11 +388,28 @@ class CircuitBreaker:
         CLOSED: Normal operation
         OPEN: Failing, reject all calls
         HALF_OPEN: Testing if service recovered
+    
+    States are small ints and only move CLOSED -> OPEN -> HALF_OPEN -> CLOSED
+    (or HALF_OPEN -> OPEN); each transition is a compare-and-set under a lock,
+    so concurrent callers cannot apply an out-of-date transition.
     """
     
-    CLOSED = "closed"
-    OPEN = "open"
-    HALF_OPEN = "half_open"
+    __slots__ = (
+        "name",
+        "_name_fmt",
+        "failure_threshold",
+        "recovery_timeout",
+        "_state",
+        "_failures",
+        "_last_failure_time",
+        "_lock",
+    )
+    
+    CLOSED = 0
+    OPEN = 1
+    HALF_OPEN = 2
+    
+    _STATE_NAMES = ("closed", "open", "half_open")
     
     def __init__(
         self,
@@ -343,63 +418,125 @@ class CircuitBreaker:
         name: str = "default"
     ):
         self.name = name
+        self._name_fmt = f"[{name}]"
         self.failure_threshold = failure_threshold
         self.recovery_timeout = recovery_timeout
         
         self._state = self.CLOSED
-        self._failure_count = 0
+        self._failures: Optional[itertools.count] = None
         self._last_failure_time: Optional[float] = None
+        self._lock = threading.Lock()
     
     @property
-    def state(self) -> str:
+    def state(self) -> int:
         """Get current state, transitioning if needed."""
+        return self.current_state(time.monotonic())
+    
+    def current_state(self, now: float) -> int:
+        """Get state as of the monotonic time `now`, transitioning if needed."""
         if self._state == self.OPEN:
-            if time.time() - self._last_failure_time >= self.recovery_timeout:
-                self._state = self.HALF_OPEN
-                logger.info(f"Circuit breaker [{self.name}] half-open")
+            if now - self._last_failure_time >= self.recovery_timeout:
+                self._transition(self.OPEN, self.HALF_OPEN)
         return self._state
     
+    @classmethod
+    def _next_state(cls, state: int, event: str, failures: int = 0, threshold: int = 1) -> int:
+        """
+        Pure transition table: the state after a "success" or "failure" event.
+        
+        Args:
+            state: Current state.
+            event: "success" or "failure".
+            failures: Consecutive failures counted so far, including this one.
+            threshold: Failures needed to open a closed circuit.
+        """
+        if event == "failure":
+            if state == cls.HALF_OPEN:
+                return cls.OPEN  # Test call failed, go straight back to open
+            if state == cls.CLOSED and failures >= threshold:
+                return cls.OPEN
+        elif event == "success" and state == cls.HALF_OPEN:
+            return cls.CLOSED
+        return state
+    
+    def _transition(self, expected: int, new: int) -> bool:
+        """Move from `expected` to `new`; no-op if another caller got there first."""
+        with self._lock:
+            if self._state != expected:
+                return False
+            self._state = new
+            self._failures = None
+        
+        if new == self.OPEN:
+            logger.warning("Circuit breaker %s opened", self._name_fmt)
+        else:
+            logger.info("Circuit breaker %s %s", self._name_fmt, self._STATE_NAMES[new])
+        return True
+    
     def record_success(self):
         """Record a successful call."""
-        self._failure_count = 0
-        if self._state == self.HALF_OPEN:
-            self._state = self.CLOSED
-            logger.info(f"Circuit breaker [{self.name}] closed")
-    
-    def record_failure(self):
-        """Record a failed call."""
-        self._failure_count += 1
-        self._last_failure_time = time.time()
-        
-        if self._failure_count >= self.failure_threshold:
-            self._state = self.OPEN
-            logger.warn(f"Circuit breaker [{self.name}] opened")
+        state = self._state
+        if state == self.CLOSED:
+            self._failures = None
+            return
+        new = self._next_state(state, "success")
+        if new != state:
+            self._transition(state, new)
     
-    def can_execute(self) -> bool:
-        """Check if calls are allowed."""
-        state = self.state
+    def record_failure(self, now: Optional[float] = None):
+        """Record a failed call at monotonic time `now` (defaults to the current time)."""
+        self._last_failure_time = time.monotonic() if now is None else now
+        
+        state = self._state
+        count = 0
         if state == self.CLOSED:
+            failures = self._failures
+            if failures is None:
+                failures = self._failures = itertools.count(1)
+            count = next(failures)
+        
+        new = self._next_state(state, "failure", count, self.failure_threshold)
+        if new != state:
+            self._transition(state, new)
+    
+    def can_execute(self, now: Optional[float] = None) -> bool:
+        """Check if calls are allowed at monotonic time `now`."""
+        if self._state != self.OPEN:
+            return True  # Closed, or half-open allowing a test call
+        
+        if now is None:
+            now = time.monotonic()
+        if now - self._last_failure_time >= self.recovery_timeout:
+            self._transition(self.OPEN, self.HALF_OPEN)
             return True
-        if state == self.HALF_OPEN:
-            return True  # Allow test call
         return False
     
     def __call__(self, func: Callable[..., T]) -> Callable[..., T]:
         """Decorator for protecting functions."""
+        breaker = self
+        
+        # A real coroutine function, so inspect/asyncio.iscoroutinefunction
+        # (and e.g. FastAPI dispatch) still see one on every Python version.
+        # Not a slotted wrapper class: before 3.12 (no markcoroutinefunction)
+        # an instance can't pass as one, and the closure cells are created
+        # once per decoration anyway, not per call
         @functools.wraps(func)
-        async def wrapper(*args: Any, **kwargs: Any) -> T:
-            if not self.can_execute():
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            # The loop clock is monotonic, like the breaker's own time base
+            if not breaker.can_execute(asyncio.get_running_loop().time()):
                 raise ModelConnectionError(
-                    f"Circuit breaker [{self.name}] is open",
-                    state=self._state
+                    f"Circuit breaker [{breaker.name}] is open",
+                    state=breaker._STATE_NAMES[breaker._state]
                 )
             
             try:
                 result = await func(*args, **kwargs)
-                self.record_success()
-                return result
-            except Exception as e:
-                self.record_failure()
+            except Exception:
+                # Stamp the failure when it happened, not when the call started,
+                # or a slow failure could open the circuit already expired
+                breaker.record_failure(asyncio.get_running_loop().time())
                 raise
+            breaker.record_success()
+            return result
         
         return wrapper
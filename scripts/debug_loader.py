@@ -2,19 +2,42 @@
 import os
 os.environ["HF_ENDPOINT"] = "https://hf-mirror.com"
 import torch
-from transformers import AutoModelForCausalLM, AutoModel, AutoTokenizer
+from huggingface_hub import snapshot_download
+from transformers import AutoModelForCausalLM, AutoModel, AutoTokenizer, BitsAndBytesConfig
+
+try:
+    import bitsandbytes  # noqa: F401
+    BNB_AVAILABLE = True
+except ImportError:
+    BNB_AVAILABLE = False
 
 model_id = "zai-org/AutoGLM-Phone-9B"
 
 print("Debugging model loading...")
 
+# Fetch the weights once; later runs (and both loads below) reuse the local copy
+LOCAL = snapshot_download(model_id, local_dir="./.hf_cache/AutoGLM-Phone-9B")
+print(f"Using local snapshot: {LOCAL}")
+
+# 4-bit NF4 weights when bitsandbytes is installed, plain FP16 otherwise
+if BNB_AVAILABLE:
+    load_kwargs = {"quantization_config": BitsAndBytesConfig(
+        load_in_4bit=True,
+        bnb_4bit_quant_type="nf4",
+        bnb_4bit_compute_dtype=torch.float16,
+    )}
+else:
+    load_kwargs = {"torch_dtype": torch.float16}
+print(f"Quantization: {'nf4' if BNB_AVAILABLE else 'none (fp16)'}")
+
 try:
     print("\n--- Attempting AutoModelForCausalLM ---")
     model = AutoModelForCausalLM.from_pretrained(
-        model_id, 
+        LOCAL, 
         trust_remote_code=True, 
         device_map="auto",
-        torch_dtype=torch.float16
+        low_cpu_mem_usage=True,
+        **load_kwargs
     )
     print(f"Success! Class: {type(model).__name__}")
     print(f"Has generate? {hasattr(model, 'generate')}")
@@ -24,10 +47,11 @@ except Exception as e:
 try:
     print("\n--- Attempting AutoModel (Base) ---")
     model = AutoModel.from_pretrained(
-        model_id, 
+        LOCAL, 
         trust_remote_code=True, 
         device_map="auto", 
-        torch_dtype=torch.float16
+        low_cpu_mem_usage=True,
+        **load_kwargs
     )
     print(f"Success! Class: {type(model).__name__}")
     print(f"Has generate? {hasattr(model, 'generate')}")
@@ -1,5 +1,6 @@
 import os
 import sys
+import httpx
 from openai import OpenAI
 from dotenv import load_dotenv
 
@@ -21,7 +22,13 @@ candidates = [
 ]
 
 print(f"Testing Base URL: {base_url}")
-client = OpenAI(base_url=base_url, api_key=api_key, timeout=5.0)
+# One pooled client for every candidate, so the connection is reused between probes
+client = OpenAI(
+    base_url=base_url,
+    api_key=api_key,
+    timeout=5.0,
+    http_client=httpx.Client(limits=httpx.Limits(max_keepalive_connections=4)),
+)
 
 working_model = None
 
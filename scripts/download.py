@@ -3,10 +3,30 @@ import os
 os.environ["HF_ENDPOINT"] = "https://hf-mirror.com"
 
 # Load model directly
-from transformers import AutoProcessor, AutoModelForMultimodalLM
+import torch
+from transformers import AutoProcessor, AutoModelForMultimodalLM, BitsAndBytesConfig
+
+try:
+    import bitsandbytes  # noqa: F401
+    BNB_AVAILABLE = True
+except ImportError:
+    BNB_AVAILABLE = False
+
+# On CUDA: 4-bit NF4 weights when bitsandbytes is installed, plain FP16 otherwise.
+# On CPU keep the default dtype; FP16 matmuls there are slow or unsupported.
+if BNB_AVAILABLE and torch.cuda.is_available():
+    load_kwargs = {"device_map": "auto", "quantization_config": BitsAndBytesConfig(
+        load_in_4bit=True,
+        bnb_4bit_quant_type="nf4",
+        bnb_4bit_compute_dtype=torch.float16,
+    )}
+elif torch.cuda.is_available():
+    load_kwargs = {"torch_dtype": torch.float16}
+else:
+    load_kwargs = {}
 
 processor = AutoProcessor.from_pretrained("zai-org/AutoGLM-Phone-9B", trust_remote_code=True)
-model = AutoModelForMultimodalLM.from_pretrained("zai-org/AutoGLM-Phone-9B", trust_remote_code=True)
+model = AutoModelForMultimodalLM.from_pretrained("zai-org/AutoGLM-Phone-9B", trust_remote_code=True, **load_kwargs)
 messages = [
     {
         "role": "user",
@@ -1,17 +1,47 @@
 import os
+import shutil
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 URL = "https://github.com/Genymobile/scrcpy/releases/download/v2.3/scrcpy-server-v2.3"
 DEST = "scrcpy-server.jar"
+PARTIAL = DEST + ".part"
+
+def make_session():
+    # One pooled connection is reused across GitHub's redirect to the CDN
+    session = requests.Session()
+    retry = Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504])
+    session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=1, max_retries=retry))
+    return session
 
 def download():
     print(f"Downloading {URL}...")
     try:
-        r = requests.get(URL, stream=True)
-        r.raise_for_status()
-        with open(DEST, 'wb') as f:
-            for chunk in r.iter_content(chunk_size=8192):
-                f.write(chunk)
+        # Resume an interrupted download instead of starting from byte 0.
+        # The .part file only ever holds bytes actually received (no
+        # preallocation), so its size is a safe resume offset.
+        offset = os.path.getsize(PARTIAL) if os.path.exists(PARTIAL) else 0
+
+        with make_session() as session:
+            headers = {"Range": f"bytes={offset}-"} if offset else {}
+            r = session.get(URL, stream=True, headers=headers)
+            if r.status_code == 416:
+                # Offset is past the end, so the partial file can't be trusted
+                print("Partial download is invalid, restarting download")
+                r.close()
+                os.remove(PARTIAL)
+                offset = 0
+                r = session.get(URL, stream=True)
+            with r:
+                r.raise_for_status()
+                resumed = r.status_code == 206
+                if offset and not resumed:
+                    print("Server ignored Range, restarting download")
+                r.raw.decode_content = True
+                with open(PARTIAL, 'ab' if resumed else 'wb') as f:
+                    shutil.copyfileobj(r.raw, f, length=1 << 20)
+        os.replace(PARTIAL, DEST)
         print(f"Downloaded to {os.path.abspath(DEST)}")
         print(f"Size: {os.path.getsize(DEST)} bytes")
     except Exception as e:
@@ -1,4 +1,5 @@
 import os
+import httpx
 from openai import OpenAI
 from dotenv import load_dotenv
 
@@ -8,7 +9,11 @@ base_url = os.getenv("PHONE_AGENT_BASE_URL")
 api_key = os.getenv("PHONE_AGENT_API_KEY")
 
 print(f"Connecting to {base_url}...")
-client = OpenAI(base_url=base_url, api_key=api_key)
+client = OpenAI(
+    base_url=base_url,
+    api_key=api_key,
+    http_client=httpx.Client(limits=httpx.Limits(max_keepalive_connections=4)),
+)
 
 try:
     models = client.models.list()
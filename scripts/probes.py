@@ -0,0 +1,80 @@
+"""
+Concurrent endpoint probes for the configured model API.
+
+Runs the model listing, chat and Anthropic-style message probes at the same
+time over one pooled httpx.AsyncClient, so a single connection (and TLS
+session) is shared instead of opening a new one per script run.
+
+Usage:
+    python scripts/probes.py
+"""
+
+import asyncio
+import os
+
+import httpx
+from dotenv import load_dotenv
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+load_dotenv()
+
+base_url = (os.getenv("PHONE_AGENT_BASE_URL") or "").rstrip("/")
+api_key = os.getenv("PHONE_AGENT_API_KEY") or "EMPTY"
+model = os.getenv("PHONE_AGENT_MODEL") or "gpt-4o"
+
+
+async def probe_models(client: httpx.AsyncClient) -> str:
+    r = await client.get(f"{base_url}/models", headers={"Authorization": f"Bearer {api_key}"})
+    r.raise_for_status()
+    ids = [m.get("id") for m in r.json().get("data", [])]
+    return f"{len(ids)} models: " + ", ".join(ids[:10])
+
+
+async def probe_chat(client: httpx.AsyncClient) -> str:
+    r = await client.post(
+        f"{base_url}/chat/completions",
+        headers={"Authorization": f"Bearer {api_key}"},
+        json={"model": model, "messages": [{"role": "user", "content": "Hi"}], "max_tokens": 5},
+    )
+    r.raise_for_status()
+    return r.json()["choices"][0]["message"]["content"]
+
+
+async def probe_anthropic(client: httpx.AsyncClient) -> str:
+    r = await client.post(
+        f"{base_url}/messages",
+        headers={"x-api-key": api_key, "anthropic-version": "2023-06-01"},
+        json={"model": model, "messages": [{"role": "user", "content": "Hi"}], "max_tokens": 5},
+    )
+    r.raise_for_status()
+    return r.json()["content"][0]["text"]
+
+
+PROBES = (probe_models, probe_chat, probe_anthropic)
+
+
+async def main():
+    print(f"Probing {base_url} (model: {model}, http2: {HTTP2_AVAILABLE})...")
+    async with httpx.AsyncClient(
+        http2=HTTP2_AVAILABLE,
+        timeout=10.0,
+        limits=httpx.Limits(max_keepalive_connections=8),
+    ) as client:
+        results = await asyncio.gather(
+            *(probe(client) for probe in PROBES), return_exceptions=True
+        )
+
+    for probe, result in zip(PROBES, results):
+        if isinstance(result, Exception):
+            print(f"❌ {probe.__name__}: {str(result)[:80]}")
+        else:
+            print(f"✅ {probe.__name__}: {result}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
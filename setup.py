@@ -36,6 +36,7 @@ setup(
     extras_require={
         "dev": [
             "pytest>=7.0.0",
+            "pytest-xdist>=3.0.0",
             "black>=23.0.0",
             "mypy>=1.0.0",
             "ruff>=0.1.0",
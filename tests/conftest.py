@@ -2,32 +2,51 @@
 Pytest configuration and shared fixtures.
 """
 import pytest
-import asyncio
 import sys
 from pathlib import Path
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 
 # =============================================================================
-# Async fixtures
+# Isolation
 # =============================================================================
 
-@pytest.fixture
-def event_loop():
-    """Create event loop for async tests."""
-    loop = asyncio.new_event_loop()
-    yield loop
-    loop.close()
+@pytest.fixture(scope="session", autouse=True)
+def _preimport():
+    """Import the package once per session (per xdist worker) before any test runs."""
+    import phone_agent  # noqa: F401
+    import phone_agent.adb  # noqa: F401
+    import phone_agent.config  # noqa: F401
+    import phone_agent.logging  # noqa: F401
+    import phone_agent.model  # noqa: F401
+
+
+_SETTINGS_SECTIONS = ("model", "device", "agent", "web", "log")
+
+
+@pytest.fixture(autouse=True)
+def _reset_globals():
+    """Restore the global settings and logger queue after each test."""
+    import copy
+    from phone_agent import logging as agent_logging
+    from phone_agent.config import settings
+    
+    saved = {name: copy.copy(getattr(settings, name)) for name in _SETTINGS_SECTIONS}
+    yield
+    for name, section in saved.items():
+        setattr(settings, name, section)
+    if agent_logging._global_queue is not None:
+        agent_logging.set_global_queue(None)
 
 
 # =============================================================================
 # Model fixtures
 # =============================================================================
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def model_config():
     """Provide a test model config."""
     from phone_agent.model import ModelConfig
@@ -38,7 +57,7 @@ def model_config():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def agent_config():
     """Provide a test agent config."""
     from phone_agent.agent import AgentConfig
@@ -49,7 +68,7 @@ def agent_config():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_model_response():
     """Provide a mock model response."""
     return {
@@ -61,6 +80,34 @@ def mock_model_response():
     }
 
 
+# Canned streamed replies keyed by the last user message content
+MOCK_STREAM_REPLIES = {
+    "test": '<think>I will tap on the button.</think>do(action="Tap", element=[500, 300])',
+    "empty": "",
+}
+
+
+def _mock_chat_handler(request):
+    """Answer /chat/completions with a canned SSE stream."""
+    import json
+    import httpx
+    
+    messages = json.loads(request.content)["messages"]
+    reply = MOCK_STREAM_REPLIES.get(messages[-1]["content"], "")
+    chunk = {"choices": [{"delta": {"content": reply}}]}
+    body = f"data: {json.dumps(chunk)}\n\ndata: [DONE]\n\n"
+    return httpx.Response(200, text=body, headers={"Content-Type": "text/event-stream"})
+
+
+@pytest.fixture(scope="session")
+async def mock_http_client():
+    """Provide an httpx.AsyncClient served by an in-process mock transport."""
+    import httpx
+    client = httpx.AsyncClient(transport=httpx.MockTransport(_mock_chat_handler))
+    yield client
+    await client.aclose()
+
+
 # =============================================================================
 # ADB fixtures
 # =============================================================================
@@ -74,6 +121,24 @@ def mock_adb_process():
     return mock_proc
 
 
+@pytest.fixture
+def mock_adb_subprocess(monkeypatch):
+    """
+    Patch asyncio.create_subprocess_exec with a fake `adb shell` process.
+    
+    The fake acknowledges every command written to it. Returns the exec
+    mock; the process is available as its return_value.
+    """
+    proc = MagicMock()
+    proc.returncode = None
+    proc.stdin.drain = AsyncMock()
+    proc.stdout.readline = AsyncMock(return_value=b"__autoglm_done__\n")
+    exec_mock = AsyncMock(return_value=proc)
+    monkeypatch.setattr("asyncio.create_subprocess_exec", exec_mock)
+    monkeypatch.setattr("phone_agent.adb.shell._sessions", {})
+    return exec_mock
+
+
 @pytest.fixture
 def mock_screenshot():
     """Provide a mock screenshot object."""
@@ -90,6 +155,27 @@ def mock_screenshot():
 # Action fixtures
 # =============================================================================
 
+@pytest.fixture(scope="session")
+def action_handler_cls():
+    """Provide the ActionHandler class (imported once per session)."""
+    from phone_agent.actions import ActionHandler
+    return ActionHandler
+
+
+@pytest.fixture(scope="session")
+def async_action_handler_cls():
+    """Provide the AsyncActionHandler class (imported once per session)."""
+    from phone_agent.actions import AsyncActionHandler
+    return AsyncActionHandler
+
+
+@pytest.fixture(scope="session")
+def parse_action_fn():
+    """Provide the parse_action function (imported once per session)."""
+    from phone_agent.actions.handler import parse_action
+    return parse_action
+
+
 @pytest.fixture
 def sample_tap_action():
     """Provide a sample tap action."""
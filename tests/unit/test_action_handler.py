@@ -3,46 +3,38 @@ Unit tests for ActionHandler and AsyncActionHandler.
 """
 import pytest
 import asyncio
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, patch
 
 
 class TestActionHandler:
     """Tests for sync ActionHandler."""
     
-    def test_init(self):
+    def test_init(self, action_handler_cls):
         """Test handler initialization."""
-        from phone_agent.actions import ActionHandler
-        
-        handler = ActionHandler(device_id="test-device")
+        handler = action_handler_cls(device_id="test-device")
         assert handler.device_id == "test-device"
     
-    def test_execute_finish(self, sample_finish_action):
+    def test_execute_finish(self, action_handler_cls, sample_finish_action):
         """Test finish action execution."""
-        from phone_agent.actions import ActionHandler
-        
-        handler = ActionHandler()
+        handler = action_handler_cls()
         result = handler.execute(sample_finish_action, 1080, 2400)
         
         assert result.success == True
         assert result.should_finish == True
         assert result.message == "Task completed successfully"
     
-    def test_execute_unknown_type(self):
+    def test_execute_unknown_type(self, action_handler_cls):
         """Test unknown action type."""
-        from phone_agent.actions import ActionHandler
-        
-        handler = ActionHandler()
+        handler = action_handler_cls()
         result = handler.execute({"_metadata": "unknown"}, 1080, 2400)
         
         assert result.success == False
         assert result.should_finish == True
         assert "Unknown action type" in result.message
     
-    def test_coordinate_conversion(self):
+    def test_coordinate_conversion(self, action_handler_cls):
         """Test relative to absolute coordinate conversion."""
-        from phone_agent.actions import ActionHandler
-        
-        handler = ActionHandler()
+        handler = action_handler_cls()
         
         # 500/1000 = 0.5, 0.5 * 1080 = 540
         x, y = handler._convert_relative_to_absolute([500, 500], 1080, 2400)
@@ -57,42 +49,55 @@ class TestActionHandler:
         x, y = handler._convert_relative_to_absolute([1000, 1000], 1080, 2400)
         assert x == 1080
         assert y == 2400
+        
+        # Lookups follow a change of screen size
+        x, y = handler._convert_relative_to_absolute([500, 500], 720, 1600)
+        assert x == 360
+        assert y == 800
+    
+    def test_init_screen_size(self, action_handler_cls):
+        """Test coordinate lookups are precomputed from the size given at init."""
+        handler = action_handler_cls(width=1080, height=2400)
+        
+        assert handler._screen_size == (1080, 2400)
+        assert handler._convert_relative_to_absolute([250, 750], 1080, 2400) == (270, 1800)
+    
+    @pytest.mark.parametrize("element, size, expected", [
+        ([850, 205], (2340, 2400), (1989, 491)),
+        ([175, 350], (1440, 1440), (251, 503)),
+        ([565, 410], (2400, 2400), (1355, 983)),
+        ([850.0, 1200], (2340, 2400), (1989, 2880)),
+    ])
+    def test_conversion_matches_truncated_ratio(self, action_handler_cls, element, size, expected):
+        """Test pixels are exactly int(e / 1000 * size), off-by-one prone values included."""
+        handler = action_handler_cls()
+        
+        assert handler._convert_relative_to_absolute(element, *size) == expected
 
 
 class TestAsyncActionHandler:
     """Tests for AsyncActionHandler."""
     
-    def test_init(self):
+    def test_init(self, async_action_handler_cls):
         """Test async handler initialization."""
-        from phone_agent.actions import AsyncActionHandler
-        
-        handler = AsyncActionHandler(device_id="test-device")
+        handler = async_action_handler_cls(device_id="test-device")
         assert handler.device_id == "test-device"
     
-    def test_execute_is_async(self):
+    def test_execute_is_async(self, async_action_handler_cls):
         """Test that execute is async."""
-        from phone_agent.actions import AsyncActionHandler
-        
-        handler = AsyncActionHandler()
-        assert asyncio.iscoroutinefunction(handler.execute)
+        assert asyncio.iscoroutinefunction(async_action_handler_cls.execute)
     
-    @pytest.mark.asyncio
-    async def test_execute_finish(self, sample_finish_action):
+    async def test_execute_finish(self, async_action_handler_cls, sample_finish_action):
         """Test async finish action execution."""
-        from phone_agent.actions import AsyncActionHandler
-        
-        handler = AsyncActionHandler()
+        handler = async_action_handler_cls()
         result = await handler.execute(sample_finish_action, 1080, 2400)
         
         assert result.success == True
         assert result.should_finish == True
     
-    @pytest.mark.asyncio
-    async def test_execute_tap(self, sample_tap_action):
+    async def test_execute_tap(self, async_action_handler_cls, sample_tap_action):
         """Test async tap action with mocked ADB."""
-        from phone_agent.actions import AsyncActionHandler
-        
-        handler = AsyncActionHandler(device_id="test-device")
+        handler = async_action_handler_cls(device_id="test-device")
         
         with patch('phone_agent.adb.async_tap', new_callable=AsyncMock) as mock_tap:
             result = await handler.execute(sample_tap_action, 1080, 2400)
@@ -101,12 +106,9 @@ class TestAsyncActionHandler:
             assert result.should_finish == False
             mock_tap.assert_called_once()
     
-    @pytest.mark.asyncio
-    async def test_execute_swipe(self, sample_swipe_action):
+    async def test_execute_swipe(self, async_action_handler_cls, sample_swipe_action):
         """Test async swipe action with mocked ADB."""
-        from phone_agent.actions import AsyncActionHandler
-        
-        handler = AsyncActionHandler(device_id="test-device")
+        handler = async_action_handler_cls(device_id="test-device")
         
         with patch('phone_agent.adb.async_swipe', new_callable=AsyncMock) as mock_swipe:
             result = await handler.execute(sample_swipe_action, 1080, 2400)
@@ -114,12 +116,9 @@ class TestAsyncActionHandler:
             assert result.success == True
             mock_swipe.assert_called_once()
     
-    @pytest.mark.asyncio
-    async def test_execute_wait(self):
+    async def test_execute_wait(self, async_action_handler_cls):
         """Test async wait action."""
-        from phone_agent.actions import AsyncActionHandler
-        
-        handler = AsyncActionHandler()
+        handler = async_action_handler_cls()
         action = {"_metadata": "do", "action": "Wait", "duration": "0.1 seconds"}
         
         start = asyncio.get_event_loop().time()
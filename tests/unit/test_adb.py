@@ -3,90 +3,124 @@ Unit tests for async ADB functions.
 """
 import pytest
 import asyncio
-from unittest.mock import AsyncMock, patch
+from inspect import iscoroutinefunction
+from unittest.mock import AsyncMock
+
+from phone_agent import adb
+from phone_agent.adb import async_back, async_home, async_swipe, async_tap
+from phone_agent.adb.adb_client import ADBServerClient
+from phone_agent.adb.input import async_send_text
+from phone_agent.adb.shell import get_shell_session
+from phone_agent.adb.screenshot import Screenshot
+from phone_agent.exceptions import DeviceCommandError
 
 
 class TestAsyncADBFunctions:
     """Tests for async ADB functions."""
     
-    def test_async_tap_is_coroutine(self):
-        """Test async_tap is a coroutine function."""
-        from phone_agent.adb import async_tap
-        assert asyncio.iscoroutinefunction(async_tap)
-    
-    def test_async_swipe_is_coroutine(self):
-        """Test async_swipe is a coroutine function."""
-        from phone_agent.adb import async_swipe
-        assert asyncio.iscoroutinefunction(async_swipe)
-    
-    def test_async_back_is_coroutine(self):
-        """Test async_back is a coroutine function."""
-        from phone_agent.adb import async_back
-        assert asyncio.iscoroutinefunction(async_back)
-    
-    def test_async_home_is_coroutine(self):
-        """Test async_home is a coroutine function."""
-        from phone_agent.adb import async_home
-        assert asyncio.iscoroutinefunction(async_home)
+    @pytest.mark.parametrize("fn_name", [
+        "async_tap",
+        "async_swipe",
+        "async_back",
+        "async_home",
+        "async_type_text",
+        "async_get_screenshot",
+        "async_clear_text",
+        "async_detect_and_set_adb_keyboard",
+    ])
+    def test_async_function_is_coroutine(self, fn_name):
+        """Test async ADB functions are coroutine functions."""
+        assert iscoroutinefunction(getattr(adb, fn_name))
     
-    def test_async_type_text_is_coroutine(self):
-        """Test async_type_text is a coroutine function."""
-        from phone_agent.adb import async_type_text
-        assert asyncio.iscoroutinefunction(async_type_text)
-    
-    def test_async_get_screenshot_is_coroutine(self):
-        """Test async_get_screenshot is a coroutine function."""
-        from phone_agent.adb import async_get_screenshot
-        assert asyncio.iscoroutinefunction(async_get_screenshot)
+    @pytest.mark.parametrize("fn, args, command", [
+        (async_tap, (100, 200), "input tap 100 200"),
+        (async_swipe, (100, 200, 300, 400), "input swipe 100 200 300 400 1000"),
+        (async_back, (), "input keyevent 4"),
+        (async_home, (), "input keyevent KEYCODE_HOME"),
+    ])
+    async def test_action_runs_in_device_shell(self, mock_adb_subprocess, fn, args, command):
+        """Test async actions write their exact command to the device shell."""
+        await fn(*args, device_id="test-device", delay=0)
+        
+        assert mock_adb_subprocess.call_args.args == ("adb", "-s", "test-device", "shell")
+        mock_adb_subprocess.return_value.stdin.write.assert_called_once_with(
+            f"{command}; echo __autoglm_done__\n".encode()
+        )
     
-    @pytest.mark.asyncio
-    async def test_async_tap_calls_subprocess(self):
-        """Test async_tap calls subprocess correctly."""
-        from phone_agent.adb import async_tap
+    async def test_actions_share_one_shell_process(self, mock_adb_subprocess):
+        """Test repeated actions reuse a single adb shell process."""
+        for _ in range(3):
+            await async_tap(100, 200, device_id="test-device", delay=0)
+        await async_back(device_id="test-device", delay=0)
         
-        with patch('asyncio.create_subprocess_exec', new_callable=AsyncMock) as mock_exec:
-            mock_proc = AsyncMock()
-            mock_proc.wait = AsyncMock(return_value=0)
-            mock_exec.return_value = mock_proc
-            
-            await async_tap(100, 200, device_id="test-device")
-            
-            mock_exec.assert_called_once()
-            args = mock_exec.call_args[0]
-            assert "adb" in args
-            assert "-s" in args
-            assert "test-device" in args
-            assert "tap" in args
+        assert mock_adb_subprocess.call_count == 1
+        assert mock_adb_subprocess.return_value.stdin.write.call_count == 4
     
-    @pytest.mark.asyncio
-    async def test_async_swipe_calls_subprocess(self):
-        """Test async_swipe calls subprocess correctly."""
-        from phone_agent.adb import async_swipe
+    async def test_cancelled_command_drops_session(self, mock_adb_subprocess):
+        """Test a cancelled command kills the shell so its sentinel can't leak."""
+        proc = mock_adb_subprocess.return_value
+        proc.stdout.readline = AsyncMock(side_effect=asyncio.Event().wait)
+        session = get_shell_session("test-device")
+        
+        task = asyncio.create_task(session.run("sleep", "1"))
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
         
-        with patch('asyncio.create_subprocess_exec', new_callable=AsyncMock) as mock_exec:
-            mock_proc = AsyncMock()
-            mock_proc.wait = AsyncMock(return_value=0)
-            mock_exec.return_value = mock_proc
-            
-            await async_swipe(100, 200, 300, 400, device_id="test-device")
-            
-            mock_exec.assert_called_once()
-            args = mock_exec.call_args[0]
-            assert "swipe" in args
+        proc.kill.assert_called_once()
+        assert session._proc is None
+
+    async def test_send_text_is_one_shell_chain(self, mock_adb_subprocess):
+        """Test keyboard switch, text and ENTER go out as a single command."""
+        await async_send_text("hi", device_id="test-device")
+        
+        write = mock_adb_subprocess.return_value.stdin.write
+        write.assert_called_once()
+        command = write.call_args.args[0].decode()
+        assert command.startswith("sh -c 'ime set com.android.adbkeyboard/.AdbIME && ")
+        assert "--es msg aGk=" in command
+        assert "input keyevent 66'" in command
 
 
-class TestAsyncInputFunctions:
-    """Tests for async input functions."""
+class TestADBServerClient:
+    """Tests for the ADB server socket client."""
     
-    def test_async_clear_text_is_coroutine(self):
-        """Test async_clear_text is a coroutine function."""
-        from phone_agent.adb import async_clear_text
-        assert asyncio.iscoroutinefunction(async_clear_text)
+    @staticmethod
+    async def _start_fake_server(reply: bytes, received: list):
+        """Start a fake ADB server that answers every request with `reply`."""
+        async def handle(reader, writer):
+            length = int(await reader.readexactly(4), 16)
+            received.append((await reader.readexactly(length)).decode())
+            writer.write(reply)
+            await writer.drain()
+            writer.close()
+        
+        return await asyncio.start_server(handle, "127.0.0.1", 0)
     
-    def test_async_detect_and_set_adb_keyboard_is_coroutine(self):
-        """Test async_detect_and_set_adb_keyboard is a coroutine function."""
-        from phone_agent.adb import async_detect_and_set_adb_keyboard
-        assert asyncio.iscoroutinefunction(async_detect_and_set_adb_keyboard)
+    async def test_get_state(self):
+        """Test get-state is sent with the host-serial prefix."""
+        received = []
+        server = await self._start_fake_server(b"OKAY0006device", received)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            client = ADBServerClient(port=port)
+            state = await client.get_state("test-device")
+        
+        assert state == "device"
+        assert received == ["host-serial:test-device:get-state"]
+    
+    async def test_fail_reply_raises(self):
+        """Test FAIL replies surface as DeviceCommandError."""
+        received = []
+        server = await self._start_fake_server(b"FAIL0010device not found", received)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            client = ADBServerClient(port=port)
+            with pytest.raises(DeviceCommandError):
+                await client.get_state()
+        
+        assert received == ["host:get-state"]
 
 
 class TestScreenshot:
@@ -94,8 +128,6 @@ class TestScreenshot:
     
     def test_screenshot_dataclass(self):
         """Test Screenshot dataclass."""
-        from phone_agent.adb.screenshot import Screenshot
-        
         ss = Screenshot(
             base64_data="test_data",
             width=1080,
@@ -3,7 +3,15 @@ Unit tests for AsyncPhoneAgent.
 """
 import pytest
 import asyncio
-from unittest.mock import AsyncMock, MagicMock, patch
+import inspect
+
+from phone_agent import (
+    AsyncCancellationToken,
+    AsyncPhoneAgent,
+    CancellationToken,
+    PhoneAgent,
+    TaskCancelledException,
+)
 
 
 class TestAsyncPhoneAgent:
@@ -11,39 +19,20 @@ class TestAsyncPhoneAgent:
     
     def test_init(self, model_config, agent_config):
         """Test agent initialization."""
-        from phone_agent import AsyncPhoneAgent
-        
         agent = AsyncPhoneAgent(model_config, agent_config)
         assert agent.model_config == model_config
         assert agent.agent_config == agent_config
         assert agent.step_count == 0
     
-    def test_init_default_config(self):
-        """Test agent with default config."""
-        from phone_agent import AsyncPhoneAgent
-        
-        agent = AsyncPhoneAgent()
-        assert agent.model_config is not None
-        assert agent.agent_config is not None
-    
-    def test_step_is_async(self, model_config, agent_config):
-        """Test that step is an async function."""
-        from phone_agent import AsyncPhoneAgent
-        
-        agent = AsyncPhoneAgent(model_config, agent_config)
-        assert asyncio.iscoroutinefunction(agent.step)
-    
-    def test_run_is_async(self, model_config, agent_config):
-        """Test that run is an async function."""
-        from phone_agent import AsyncPhoneAgent
-        
-        agent = AsyncPhoneAgent(model_config, agent_config)
-        assert asyncio.iscoroutinefunction(agent.run)
+    def test_step_and_run_are_async(self):
+        """Test that step and run are async functions."""
+        async_methods = {
+            name for name, _ in inspect.getmembers(AsyncPhoneAgent, predicate=inspect.iscoroutinefunction)
+        }
+        assert {"step", "run"} <= async_methods
     
     def test_reset(self, model_config, agent_config):
         """Test agent reset."""
-        from phone_agent import AsyncPhoneAgent
-        
         agent = AsyncPhoneAgent(model_config, agent_config)
         agent._step_count = 5
         agent._cancelled = True
@@ -56,14 +45,20 @@ class TestAsyncPhoneAgent:
     
     def test_cancel(self, model_config, agent_config):
         """Test agent cancel."""
-        from phone_agent import AsyncPhoneAgent
-        
         agent = AsyncPhoneAgent(model_config, agent_config)
         assert agent._cancelled == False
         
         agent.cancel()
         
         assert agent._cancelled == True
+    
+    async def test_step_stops_at_max_steps(self, model_config, agent_config):
+        """Test step raises once agent_config.max_steps steps have run."""
+        agent = AsyncPhoneAgent(model_config, agent_config)
+        agent._step_count = agent_config.max_steps
+        
+        with pytest.raises(TaskCancelledException, match="Max steps reached"):
+            await agent.step("test")
 
 
 class TestPhoneAgent:
@@ -71,18 +66,21 @@ class TestPhoneAgent:
     
     def test_init(self, model_config, agent_config):
         """Test agent initialization."""
-        from phone_agent import PhoneAgent
-        
         agent = PhoneAgent(model_config, agent_config)
         assert agent.model_config == model_config
         assert agent.step_count == 0
     
-    def test_step_is_sync(self, model_config, agent_config):
+    def test_step_is_sync(self):
         """Test that step is NOT an async function."""
-        from phone_agent import PhoneAgent
-        
+        assert not asyncio.iscoroutinefunction(PhoneAgent.step)
+    
+    def test_step_stops_at_max_steps(self, model_config, agent_config):
+        """Test step raises once agent_config.max_steps steps have run."""
         agent = PhoneAgent(model_config, agent_config)
-        assert not asyncio.iscoroutinefunction(agent.step)
+        agent._step_count = agent_config.max_steps
+        
+        with pytest.raises(TaskCancelledException, match="Max steps reached"):
+            agent.step("test")
 
 
 class TestCancellationToken:
@@ -90,8 +88,6 @@ class TestCancellationToken:
     
     def test_sync_token(self):
         """Test synchronous CancellationToken."""
-        from phone_agent import CancellationToken
-        
         token = CancellationToken()
         assert token.is_cancelled == False
         
@@ -103,8 +99,6 @@ class TestCancellationToken:
     
     def test_async_token(self):
         """Test AsyncCancellationToken."""
-        from phone_agent import AsyncCancellationToken
-        
         token = AsyncCancellationToken()
         assert token.is_cancelled == False
         
@@ -114,11 +108,8 @@ class TestCancellationToken:
         token.reset()
         assert token.is_cancelled == False
     
-    @pytest.mark.asyncio
     async def test_async_token_check(self):
         """Test AsyncCancellationToken.check()."""
-        from phone_agent import AsyncCancellationToken
-        
         token = AsyncCancellationToken()
         
         # Should not raise when not cancelled
@@ -128,3 +119,22 @@ class TestCancellationToken:
         token.cancel()
         with pytest.raises(asyncio.CancelledError):
             await token.check()
+    
+    async def test_async_token_stops_worker_task(self):
+        """Test cancelling the token stops a polling worker task."""
+        token = AsyncCancellationToken()
+        steps = 0
+        
+        async def worker():
+            nonlocal steps
+            while not token.is_cancelled:
+                steps += 1
+                await asyncio.sleep(0.01)
+        
+        task = asyncio.create_task(worker())
+        await asyncio.sleep(0.05)
+        token.cancel()
+        await asyncio.wait_for(task, timeout=1.0)
+        
+        assert task.done()
+        assert steps > 0
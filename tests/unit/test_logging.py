@@ -2,7 +2,23 @@
 Unit tests for structured logging.
 """
 import pytest
-from io import StringIO
+import json
+import os
+from dataclasses import asdict
+
+from phone_agent.logging import (
+    _ConsoleWriter,
+    LogEntry,
+    LogLevel,
+    StructuredLogger,
+    get_logger,
+)
+
+
+@pytest.fixture(scope="module")
+def sample_entry():
+    """A LogEntry with a fixed timestamp, shared read-only across tests."""
+    return LogEntry(ts=1700000000.0, module="test", level="INFO", msg="test message")
 
 
 class TestStructuredLogger:
@@ -10,97 +26,122 @@ class TestStructuredLogger:
     
     def test_get_logger(self):
         """Test getting a logger instance."""
-        from phone_agent.logging import get_logger
-        
         logger = get_logger("test")
         assert logger is not None
         assert logger.module == "test"
     
     def test_logger_singleton(self):
         """Test logger singleton behavior."""
-        from phone_agent.logging import get_logger
-        
         logger1 = get_logger("singleton_test")
         logger2 = get_logger("singleton_test")
         
         assert logger1 is logger2
     
-    def test_log_levels(self):
-        """Test log level methods exist."""
-        from phone_agent.logging import get_logger
+    @pytest.mark.parametrize("method, level", [
+        ("debug", "DEBUG"),
+        ("info", "INFO"),
+        ("warn", "WARN"),
+        ("warning", "WARN"),
+        ("error", "ERROR"),
+    ])
+    def test_log_levels(self, monkeypatch, capsys, method, level):
+        """Test each level method emits a line at its level."""
+        monkeypatch.setenv("NO_COLOR", "1")
+        logger = StructuredLogger("level_test", min_level=LogLevel.DEBUG)
+        getattr(logger, method)("test %s", method)
         
-        logger = get_logger("level_test")
+        entry = json.loads(capsys.readouterr().out)
+        assert (entry["level"], entry["msg"]) == (level, f"test {method}")
+    
+    @pytest.mark.parametrize("method, args, expected", [
+        ("thought", ("thinking...",), {"level": "AGENT", "tag": "THOUGHT", "msg": "thinking..."}),
+        ("action", ("Tap", {"element": [100, 200]}), {
+            "level": "AGENT", "tag": "ACTION", "msg": "Tap",
+            "details": {"action_details": {"element": [100, 200]}},
+        }),
+        ("result", ("done",), {"level": "AGENT", "tag": "RESULT", "msg": "done"}),
+        ("cancelled", ("cancelled",), {"level": "WARN", "tag": "CANCELLED", "msg": "cancelled"}),
+        ("failed", ("failed",), {"level": "ERROR", "tag": "FAILED", "msg": "failed"}),
+    ])
+    def test_agent_methods(self, monkeypatch, capsys, method, args, expected):
+        """Test agent-specific methods emit their tag, message and details."""
+        monkeypatch.setenv("NO_COLOR", "1")
+        logger = StructuredLogger("agent_test")
+        getattr(logger, method)(*args)
+        
+        entry = json.loads(capsys.readouterr().out)
+        assert {key: entry.get(key) for key in expected} == expected
+    
+    def test_no_color_uses_json(self, monkeypatch, capsys):
+        """Test NO_COLOR selects plain JSON console output."""
+        monkeypatch.setenv("NO_COLOR", "1")
+        logger = StructuredLogger("no_color_test")
+        logger.info("plain")
         
-        # Should not raise
-        logger.info("test info")
-        logger.warn("test warn")
-        logger.error("test error")
-        logger.debug("test debug")
+        out = capsys.readouterr().out.strip()
+        assert json.loads(out)["msg"] == "plain"
     
-    def test_agent_methods(self):
-        """Test agent-specific log methods."""
-        from phone_agent.logging import get_logger
+    def test_lazy_format_args(self, capsys):
+        """Test %-style args are only formatted for enabled levels."""
+        class Boom:
+            def __str__(self):
+                raise AssertionError("formatted a disabled message")
         
-        logger = get_logger("agent_test")
+        logger = StructuredLogger("test", min_level=LogLevel.WARN)
+        logger.info("skipped %s", Boom())
+        logger.warning("breaker %s opened", "[api]")
         
-        # Should not raise
-        logger.thought("thinking...")
-        logger.action("Tap", {"element": [100, 200]})
-        logger.result("done")
-        logger.cancelled("cancelled")
-        logger.failed("failed")
+        assert "breaker [api] opened" in capsys.readouterr().out
+    
+    def test_console_writer_coalesces(self):
+        """Test queued console lines are emitted as one batched write."""
+        read_fd, write_fd = os.pipe()
+        try:
+            writer = _ConsoleWriter()
+            writer._fd = write_fd
+            writer._queue.put(b"one\n")
+            writer._queue.put(b"two\n")
+            writer.flush()
+            
+            assert os.read(read_fd, 64) == b"one\ntwo\n"
+        finally:
+            os.close(read_fd)
+            os.close(write_fd)
 
 
 class TestLogEntry:
     """Tests for LogEntry dataclass."""
     
-    def test_log_entry_creation(self):
+    def test_log_entry_creation(self, sample_entry):
         """Test LogEntry creation."""
-        from phone_agent.logging import LogEntry
-        import time
-        
-        entry = LogEntry(
-            ts=time.time(),
-            module="test",
-            level="INFO",
-            msg="test message"
-        )
+        assert sample_entry.module == "test"
+        assert sample_entry.level == "INFO"
+        assert sample_entry.msg == "test message"
+        assert not hasattr(sample_entry, "__dict__")
+    
+    def test_log_entry_to_json_omits_none(self):
+        """Test LogEntry JSON output skips unset optional fields."""
+        entry = LogEntry(ts=1.0, module="test", level="AGENT", msg="hi", tag="THOUGHT")
         
-        assert entry.module == "test"
-        assert entry.level == "INFO"
-        assert entry.msg == "test message"
+        assert json.loads(entry.to_json()) == {
+            "ts": 1.0, "module": "test", "level": "AGENT", "msg": "hi", "tag": "THOUGHT",
+        }
     
-    def test_log_entry_to_console(self):
+    def test_log_entry_to_console(self, sample_entry):
         """Test LogEntry console formatting."""
-        from phone_agent.logging import LogEntry
-        import time
-        
-        entry = LogEntry(
-            ts=time.time(),
-            module="test",
-            level="INFO",
-            msg="test message"
-        )
-        
-        console_output = entry.to_console()
+        console_output = sample_entry.to_console()
         assert isinstance(console_output, str)
         assert "test message" in console_output
     
-    def test_log_entry_to_json(self):
-        """Test LogEntry JSON formatting."""
-        from phone_agent.logging import LogEntry
-        import time
-        import json
-        
-        entry = LogEntry(
-            ts=time.time(),
-            module="test",
-            level="INFO",
-            msg="test message"
-        )
-        
-        json_output = entry.to_json()
-        parsed = json.loads(json_output)
-        
-        assert parsed["module"] == "test"
-        assert parsed["msg"] == "test message"
+    def test_log_entry_fields(self, sample_entry):
+        """Test LogEntry structure without going through JSON."""
+        assert asdict(sample_entry) == {
+            "ts": 1700000000.0, "module": "test", "level": "INFO", "msg": "test message",
+            "tag": None, "details": None,
+        }
+    
+    def test_log_entry_to_json(self, sample_entry):
+        """Test LogEntry JSON output is valid JSON."""
+        json_output = sample_entry.to_json()
+        assert isinstance(json_output, str)
+        json.loads(json_output)
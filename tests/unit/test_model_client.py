@@ -1,9 +1,14 @@
 """
 Unit tests for AsyncModelClient.
 """
-import pytest
 import asyncio
-from unittest.mock import AsyncMock, MagicMock, patch
+import base64
+import io
+from unittest.mock import MagicMock
+from PIL import Image
+
+from phone_agent.model import AsyncModelClient, ModelClient, ModelConfig
+from phone_agent.model.client import MessageBuilder
 
 
 class TestAsyncModelClient:
@@ -11,71 +16,106 @@ class TestAsyncModelClient:
     
     def test_init(self, model_config):
         """Test client initialization."""
-        from phone_agent.model import AsyncModelClient
-        
         client = AsyncModelClient(model_config)
         assert client.config == model_config
         assert client.config.model_name == "test-model"
     
-    def test_init_default_config(self):
-        """Test client with default config."""
-        from phone_agent.model import AsyncModelClient
+    def test_request_is_async(self):
+        """Test that request is an async function."""
+        assert asyncio.iscoroutinefunction(AsyncModelClient.request)
+    
+    async def test_request_success(self, model_config, mock_http_client):
+        """Test successful API request."""
+        client = AsyncModelClient(model_config, http_client=mock_http_client)
+        response = await client.request([{"role": "user", "content": "test"}])
         
-        client = AsyncModelClient()
-        assert client.config is not None
+        assert response.thinking == "<think>I will tap on the button.</think>"
+        assert response.action == 'do(action="Tap", element=[500, 300])'
     
-    def test_request_is_async(self, model_config):
-        """Test that request is an async function."""
-        from phone_agent.model import AsyncModelClient
+    async def test_request_empty_response(self, model_config, mock_http_client):
+        """Test handling of empty response."""
+        client = AsyncModelClient(model_config, http_client=mock_http_client)
+        response = await client.request([{"role": "user", "content": "empty"}])
         
-        client = AsyncModelClient(model_config)
-        assert asyncio.iscoroutinefunction(client.request)
+        # Should return empty but not crash
+        assert response is not None
+        assert response.raw_content == ""
+
+
+class TestModelClient:
+    """Tests for sync ModelClient."""
     
-    @pytest.mark.asyncio
-    async def test_request_success(self, model_config, mock_model_response):
-        """Test successful API request."""
-        from phone_agent.model import AsyncModelClient
+    def test_reuses_pooled_http_client(self, model_config):
+        """Test the OpenAI client is bound to one pooled httpx client."""
+        with ModelClient(model_config) as client:
+            assert client._http_client is not None
+            assert client.client._client is client._http_client
         
-        client = AsyncModelClient(model_config)
+        assert client._http_client is None
+    
+    def test_parse_response_markers(self, model_config):
+        """Test finish/do/answer markers are split in priority order."""
+        client = ModelClient(model_config)
+        
+        assert client._parse_response('think do(action="Back") finish(message="ok")') == (
+            'think do(action="Back")', 'finish(message="ok")'
+        )
+        assert client._parse_response('<think>hm</think><answer>do(action="Home")</answer>') == (
+            "<think>hm</think><answer>", 'do(action="Home")</answer>'
+        )
+        assert client._parse_response("<think>hm</think><answer>ok</answer>") == ("hm", "ok")
+        assert client._parse_response("no markers") == ("", "no markers")
+    
+    def test_parse_response_json(self, model_config):
+        """Test JSON-formatted responses are parsed first."""
+        client = ModelClient(model_config)
+        content = '```json\n{"thinking": "t", "action": "do(action=\\"Back\\")"}\n```'
         
-        with patch('httpx.AsyncClient') as mock_client_class:
-            mock_client = AsyncMock()
-            mock_response = MagicMock()
-            mock_response.json.return_value = mock_model_response
-            mock_response.raise_for_status = MagicMock()
-            mock_client.post = AsyncMock(return_value=mock_response)
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=None)
-            mock_client_class.return_value = mock_client
-            
-            response = await client.request([{"role": "user", "content": "test"}])
-            
-            assert response is not None
-            assert response.thinking is not None or response.action is not None
+        assert client._parse_response(content) == ("t", 'do(action="Back")')
     
-    @pytest.mark.asyncio
-    async def test_request_empty_response(self, model_config):
-        """Test handling of empty response."""
-        from phone_agent.model import AsyncModelClient
+    def test_request_anthropic_converts_data_url(self, model_config):
+        """Test OpenAI data URLs are converted to Anthropic image blocks."""
+        client = ModelClient(model_config)
+        client.anthropic_client = MagicMock()
+        client.anthropic_client.messages.create.return_value.content = [
+            MagicMock(text='finish(message="ok")')
+        ]
+        messages = [{
+            "role": "user",
+            "content": [{"type": "image_url", "image_url": {"url": "data:image/png;base64,QUJD"}}],
+        }]
         
-        client = AsyncModelClient(model_config)
+        client._request_anthropic(messages)
+        
+        sent = client.anthropic_client.messages.create.call_args.kwargs["messages"]
+        assert sent[0]["content"][0]["source"] == {
+            "type": "base64", "media_type": "image/png", "data": "QUJD"
+        }
+
+
+class TestMessageBuilder:
+    """Tests for MessageBuilder image handling."""
+    
+    @staticmethod
+    def _encode(fmt, size=(100, 200), mode="RGB"):
+        buf = io.BytesIO()
+        Image.new(mode, size).save(buf, format=fmt)
+        return base64.b64encode(buf.getvalue()).decode("utf-8")
+    
+    def test_small_jpeg_passthrough(self):
+        """Test small JPEG screenshots are not re-encoded."""
+        b64 = self._encode("JPEG")
+        msg = MessageBuilder.create_user_message("hi", image_base64=b64)
         
-        with patch('httpx.AsyncClient') as mock_client_class:
-            mock_client = AsyncMock()
-            mock_response = MagicMock()
-            mock_response.json.return_value = {
-                "choices": [{"message": {"content": ""}}]
-            }
-            mock_response.raise_for_status = MagicMock()
-            mock_client.post = AsyncMock(return_value=mock_response)
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=None)
-            mock_client_class.return_value = mock_client
-            
-            response = await client.request([{"role": "user", "content": "test"}])
-            
-            # Should return empty but not crash
-            assert response is not None
+        assert msg["content"][0]["image_url"]["url"] == f"data:image/jpeg;base64,{b64}"
+    
+    def test_png_converted_to_jpeg(self):
+        """Test PNG screenshots are encoded to JPEG."""
+        b64 = self._encode("PNG", mode="RGBA")
+        msg = MessageBuilder.create_user_message("hi", image_base64=b64)
+        
+        data = msg["content"][0]["image_url"]["url"].split(",", 1)[1]
+        assert base64.b64decode(data)[:3] == b"\xff\xd8\xff"
 
 
 class TestModelConfig:
@@ -83,16 +123,12 @@ class TestModelConfig:
     
     def test_default_values(self):
         """Test default config values."""
-        from phone_agent.model import ModelConfig
-        
         config = ModelConfig()
         assert config.max_tokens > 0
         assert config.temperature >= 0
     
     def test_custom_values(self):
         """Test custom config values."""
-        from phone_agent.model import ModelConfig
-        
         config = ModelConfig(
             base_url="http://custom:8080",
             api_key="custom-key",
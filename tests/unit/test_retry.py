@@ -3,16 +3,37 @@ Unit tests for retry and recovery utilities.
 """
 import pytest
 import asyncio
+import inspect
 from unittest.mock import AsyncMock, MagicMock
 
+from phone_agent import (
+    ADBConnectionManager,
+    CircuitBreaker,
+    RetryConfig,
+    retry_async,
+    retry_sync,
+    with_retry,
+)
+from phone_agent.exceptions import ModelConnectionError
+from phone_agent.retry import _delay_schedule
 
+
+@pytest.fixture
+def no_sleep(monkeypatch):
+    """Make backoff sleeps no-ops; only the retry logic is under test."""
+    sync_sleep = MagicMock(return_value=None)
+    async_sleep = AsyncMock(return_value=None)
+    monkeypatch.setattr("phone_agent.retry.time.sleep", sync_sleep)
+    monkeypatch.setattr("phone_agent.retry.asyncio.sleep", async_sleep)
+    return sync_sleep, async_sleep
+
+
+@pytest.mark.usefixtures("no_sleep")
 class TestRetryDecorators:
     """Tests for retry decorators."""
     
     def test_retry_sync_success(self):
         """Test sync retry with immediate success."""
-        from phone_agent import retry_sync
-        
         call_count = 0
         
         @retry_sync(max_attempts=3)
@@ -27,8 +48,6 @@ class TestRetryDecorators:
     
     def test_retry_sync_eventual_success(self):
         """Test sync retry with eventual success."""
-        from phone_agent import retry_sync
-        
         call_count = 0
         
         @retry_sync(max_attempts=3, base_delay=0.01)
@@ -43,10 +62,8 @@ class TestRetryDecorators:
         assert result == "success"
         assert call_count == 2
     
-    def test_retry_sync_max_attempts(self):
+    def test_retry_sync_max_attempts(self, no_sleep):
         """Test sync retry exhausts all attempts."""
-        from phone_agent import retry_sync
-        
         call_count = 0
         
         @retry_sync(max_attempts=3, base_delay=0.01)
@@ -58,12 +75,10 @@ class TestRetryDecorators:
         with pytest.raises(ValueError):
             func()
         assert call_count == 3
+        assert no_sleep[0].call_count == 2
     
-    @pytest.mark.asyncio
     async def test_retry_async_success(self):
         """Test async retry with immediate success."""
-        from phone_agent import retry_async
-        
         call_count = 0
         
         @retry_async(max_attempts=3)
@@ -76,11 +91,8 @@ class TestRetryDecorators:
         assert result == "success"
         assert call_count == 1
     
-    @pytest.mark.asyncio
     async def test_retry_async_eventual_success(self):
         """Test async retry with eventual success."""
-        from phone_agent import retry_async
-        
         call_count = 0
         
         @retry_async(max_attempts=3, base_delay=0.01)
@@ -96,25 +108,20 @@ class TestRetryDecorators:
         assert call_count == 2
 
 
+@pytest.mark.usefixtures("no_sleep")
 class TestWithRetry:
     """Tests for with_retry helper."""
     
-    @pytest.mark.asyncio
     async def test_with_retry_success(self):
         """Test with_retry on success."""
-        from phone_agent import with_retry
-        
         async def success_func():
             return "done"
         
         result = await with_retry(success_func, max_attempts=3)
         assert result == "done"
     
-    @pytest.mark.asyncio
     async def test_with_retry_failure(self):
         """Test with_retry on failure."""
-        from phone_agent import with_retry
-        
         call_count = 0
         
         async def always_fail():
@@ -133,21 +140,32 @@ class TestCircuitBreaker:
     
     def test_initial_state_closed(self):
         """Test circuit breaker starts closed."""
-        from phone_agent import CircuitBreaker
-        
         cb = CircuitBreaker()
         assert cb.state == CircuitBreaker.CLOSED
         assert cb.can_execute() == True
+        assert not hasattr(cb, "__dict__")
+    
+    @pytest.mark.parametrize("state, event, failures, expected", [
+        (CircuitBreaker.CLOSED, "failure", 2, CircuitBreaker.CLOSED),
+        (CircuitBreaker.CLOSED, "failure", 3, CircuitBreaker.OPEN),
+        (CircuitBreaker.CLOSED, "success", 0, CircuitBreaker.CLOSED),
+        (CircuitBreaker.OPEN, "failure", 3, CircuitBreaker.OPEN),
+        (CircuitBreaker.OPEN, "success", 0, CircuitBreaker.OPEN),
+        (CircuitBreaker.HALF_OPEN, "failure", 0, CircuitBreaker.OPEN),
+        (CircuitBreaker.HALF_OPEN, "success", 0, CircuitBreaker.CLOSED),
+    ])
+    def test_next_state(self, state, event, failures, expected):
+        """Test the success/failure transition table."""
+        assert CircuitBreaker._next_state(state, event, failures, threshold=3) == expected
     
     def test_opens_after_failures(self):
-        """Test circuit opens after threshold failures."""
-        from phone_agent import CircuitBreaker
-        
+        """Test circuit opens after threshold failures, and success resets the count."""
         cb = CircuitBreaker(failure_threshold=3)
         
         cb.record_failure()
-        assert cb.state == CircuitBreaker.CLOSED
-        
+        cb.record_failure()
+        cb.record_success()
+        cb.record_failure()
         cb.record_failure()
         assert cb.state == CircuitBreaker.CLOSED
         
@@ -155,29 +173,72 @@ class TestCircuitBreaker:
         assert cb.state == CircuitBreaker.OPEN
         assert cb.can_execute() == False
     
-    def test_success_resets_failures(self):
-        """Test success resets failure count."""
-        from phone_agent import CircuitBreaker
+    def test_half_open_after_recovery_timeout(self):
+        """Test circuit half-opens once the recovery timeout has elapsed."""
+        cb = CircuitBreaker(failure_threshold=1, recovery_timeout=10.0)
+        cb.record_failure(now=100.0)
+        
+        assert cb.can_execute(now=105.0) == False
+        assert cb.can_execute(now=110.0) == True
+        assert cb.current_state(110.0) == CircuitBreaker.HALF_OPEN
+    
+    def test_half_open_failure_reopens(self):
+        """Test a failed test call sends the circuit straight back to open."""
+        cb = CircuitBreaker(failure_threshold=3, recovery_timeout=10.0)
+        for _ in range(3):
+            cb.record_failure(now=0.0)
+        assert cb.current_state(10.0) == CircuitBreaker.HALF_OPEN
         
-        cb = CircuitBreaker(failure_threshold=3)
+        cb.record_failure(now=10.0)
+        assert cb.current_state(15.0) == CircuitBreaker.OPEN
         
-        cb.record_failure()
-        cb.record_failure()
+        assert cb.current_state(20.0) == CircuitBreaker.HALF_OPEN
         cb.record_success()
+        assert cb.current_state(20.0) == CircuitBreaker.CLOSED
+    
+    async def test_decorator_rejects_when_open(self):
+        """Test decorated coroutines and methods are guarded by the breaker."""
+        cb = CircuitBreaker(failure_threshold=1, recovery_timeout=60.0)
+        
+        class Service:
+            @cb
+            async def call(self, fail: bool):
+                """Call the service."""
+                if fail:
+                    raise RuntimeError("boom")
+                return self
+        
+        service = Service()
+        assert Service.call.__name__ == "call"
+        assert inspect.iscoroutinefunction(Service.call)
+        assert await service.call(False) is service
+        
+        with pytest.raises(RuntimeError):
+            await service.call(True)
+        with pytest.raises(ModelConnectionError):
+            await service.call(False)
+    
+    async def test_decorator_stamps_failure_when_it_happens(self, monkeypatch):
+        """Test a slow failure opens the circuit from its end time, not its start."""
+        cb = CircuitBreaker(failure_threshold=1, recovery_timeout=30.0)
+        clock = [0.0]
+        monkeypatch.setattr(asyncio.get_running_loop(), "time", lambda: clock[0])
+        
+        @cb
+        async def slow_failure():
+            clock[0] = 60.0  # Fails after longer than the recovery timeout
+            raise RuntimeError("timeout")
+        
+        with pytest.raises(RuntimeError):
+            await slow_failure()
+        assert cb.can_execute(now=70.0) == False
         
-        # Should be reset, need 3 more failures
-        cb.record_failure()
-        cb.record_failure()
-        assert cb.state == CircuitBreaker.CLOSED
-
 
 class TestADBConnectionManager:
     """Tests for ADBConnectionManager."""
     
     def test_init(self):
         """Test manager initialization."""
-        from phone_agent import ADBConnectionManager
-        
         manager = ADBConnectionManager(device_id="test-device")
         assert manager.device_id == "test-device"
         assert manager.max_reconnect_attempts == 3
@@ -188,8 +249,6 @@ class TestRetryConfig:
     
     def test_default_values(self):
         """Test default config values."""
-        from phone_agent import RetryConfig
-        
         config = RetryConfig()
         assert config.max_attempts == 3
         assert config.base_delay == 1.0
@@ -197,8 +256,6 @@ class TestRetryConfig:
     
     def test_custom_values(self):
         """Test custom config values."""
-        from phone_agent import RetryConfig
-        
         config = RetryConfig(
             max_attempts=5,
             base_delay=0.5,
@@ -207,3 +264,12 @@ class TestRetryConfig:
         assert config.max_attempts == 5
         assert config.base_delay == 0.5
         assert config.max_delay == 60.0
+    
+    def test_delay_schedule(self):
+        """Test precomputed backoff schedule is capped and sized per retry."""
+        config = RetryConfig(
+            max_attempts=5,
+            base_delay=1.0,
+            max_delay=5.0
+        )
+        assert _delay_schedule(config) == (1.0, 2.0, 4.0, 5.0)
@@ -2,60 +2,52 @@
 Unit tests for settings configuration.
 """
 import pytest
+import copy
 import os
 from unittest.mock import patch
 
+from phone_agent.config import (
+    AgentSettings,
+    DeviceSettings,
+    LogSettings,
+    ModelSettings,
+    Settings,
+    WebSettings,
+    configure,
+    get_settings,
+    settings,
+)
+
 
 class TestSettings:
     """Tests for Settings class."""
     
     def test_settings_import(self):
         """Test settings can be imported."""
-        from phone_agent.config import settings
         assert settings is not None
     
     def test_settings_singleton(self):
         """Test settings is a singleton."""
-        from phone_agent.config import settings, get_settings
         assert settings is get_settings()
     
-    def test_default_model_settings(self):
-        """Test default model settings."""
-        from phone_agent.config import ModelSettings
-        
-        model = ModelSettings()
-        assert model.max_tokens == 4096
-        assert model.temperature == 0.7
-        assert model.max_retries == 3
-    
-    def test_default_device_settings(self):
-        """Test default device settings."""
-        from phone_agent.config import DeviceSettings
-        
-        device = DeviceSettings()
-        assert device.adb_path == "adb"
-        assert device.screenshot_timeout == 10
-    
-    def test_default_agent_settings(self):
-        """Test default agent settings."""
-        from phone_agent.config import AgentSettings
-        
-        agent = AgentSettings()
-        assert agent.max_steps == 100
-        assert agent.language == "zh"
-    
-    def test_default_web_settings(self):
-        """Test default web settings."""
-        from phone_agent.config import WebSettings
-        
-        web = WebSettings()
-        assert web.port == 8000
-        assert web.host == "0.0.0.0"
+    @pytest.mark.parametrize("cls, attr, expected", [
+        (ModelSettings, "max_tokens", 4096),
+        (ModelSettings, "temperature", 0.7),
+        (ModelSettings, "max_retries", 3),
+        (DeviceSettings, "adb_path", "adb"),
+        (DeviceSettings, "screenshot_timeout", 10),
+        (AgentSettings, "max_steps", 100),
+        (AgentSettings, "language", "zh"),
+        (WebSettings, "port", 8000),
+        (WebSettings, "host", "0.0.0.0"),
+        (WebSettings, "stream_raw", True),
+    ])
+    def test_default_values(self, cls, attr, expected):
+        """Test default section settings."""
+        assert getattr(cls(), attr) == expected
     
     def test_to_dict(self):
         """Test settings to_dict method."""
-        from phone_agent.config import Settings
-        
         settings = Settings()
         d = settings.to_dict()
         
@@ -72,49 +64,40 @@ class TestSettings:
 class TestConfigure:
     """Tests for configure function."""
     
-    def test_configure_model(self):
-        """Test configuring model settings."""
-        from phone_agent.config import Settings, configure
+    @pytest.mark.parametrize("key, section, attr, value", [
+        ("model_max_tokens", "model", "max_tokens", 1000),
+        ("web_port", "web", "port", 9000),
+    ])
+    def test_configure(self, key, section, attr, value):
+        """Test configuring a setting by its section_attr key."""
+        configure(**{key: value})
         
-        # Create fresh settings for test
-        settings = Settings()
-        settings.model.max_tokens = 1000
-        
-        assert settings.model.max_tokens == 1000
-    
-    def test_configure_web_port(self):
-        """Test configuring web port."""
-        from phone_agent.config import Settings
-        
-        settings = Settings()
-        settings.web.port = 9000
-        
-        assert settings.web.port == 9000
+        assert getattr(getattr(settings, section), attr) == value
 
 
 class TestEnvLoading:
     """Tests for environment variable loading."""
     
-    def test_load_api_key_from_env(self):
-        """Test loading API key from environment."""
-        from phone_agent.config import Settings
-        
-        with patch.dict(os.environ, {"AUTOGLM_API_KEY": "test-key-123"}):
-            settings = Settings()
-            assert settings.model.api_key == "test-key-123"
+    @pytest.fixture(scope="class")
+    def base_settings(self):
+        """Construct Settings (env + YAML lookup) once for the class."""
+        return Settings()
     
-    def test_load_port_from_env(self):
-        """Test loading port from environment."""
-        from phone_agent.config import Settings
+    @pytest.mark.parametrize("env_var, value, section, attr, expected", [
+        ("AUTOGLM_API_KEY", "test-key-123", "model", "api_key", "test-key-123"),
+        ("AUTOGLM_PORT", "9999", "web", "port", 9999),
+        ("AUTOGLM_DEBUG", "true", "web", "debug", True),
+    ])
+    def test_load_from_env(self, base_settings, env_var, value, section, attr, expected):
+        """Test loading a setting from its environment variable."""
+        settings = copy.copy(base_settings)
+        settings.model = ModelSettings()
+        settings.device = DeviceSettings()
+        settings.agent = AgentSettings()
+        settings.web = WebSettings()
+        settings.log = LogSettings()
         
-        with patch.dict(os.environ, {"AUTOGLM_PORT": "9999"}):
-            settings = Settings()
-            assert settings.web.port == 9999
-    
-    def test_load_debug_from_env(self):
-        """Test loading debug flag from environment."""
-        from phone_agent.config import Settings
+        with patch.dict(os.environ, {env_var: value}):
+            settings._load_from_env()
         
-        with patch.dict(os.environ, {"AUTOGLM_DEBUG": "true"}):
-            settings = Settings()
-            assert settings.web.debug == True
+        assert getattr(getattr(settings, section), attr) == expected
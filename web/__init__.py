@@ -1,15 +1,37 @@
 """Web package for AutoGLM Console."""
 
-from web.state import app_state, AppState
-from web.models import Profile, ChatRequest
-from web.profiles import load_profiles, save_profiles, get_active_profile
+import importlib
 
 __all__ = [
     "app_state",
-    "AppState", 
+    "AppState",
     "Profile",
     "ChatRequest",
     "load_profiles",
     "save_profiles",
     "get_active_profile",
 ]
+
+# Exported name -> defining submodule, imported on first access (PEP 562)
+_LAZY = {
+    "app_state": "web.state",
+    "AppState": "web.state",
+    "Profile": "web.models",
+    "ChatRequest": "web.models",
+    "load_profiles": "web.profiles",
+    "save_profiles": "web.profiles",
+    "get_active_profile": "web.profiles",
+}
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value  # Cache so later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
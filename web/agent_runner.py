@@ -1,6 +1,7 @@
 """Agent task execution and lifecycle management (Async version)."""
 
 import asyncio
+import contextlib
 import sys
 import uuid
 from typing import Optional
@@ -9,12 +10,23 @@ from web.state import app_state
 from web.profiles import get_active_profile
 from phone_agent import AsyncPhoneAgent, PhoneAgent, TaskCancelledException, get_logger
 from phone_agent.model import ModelConfig
-from phone_agent.agent import AgentConfig
+from phone_agent.agent import AgentConfig, StepResult
+from phone_agent.config import settings
 
 # Module logger
 logger = get_logger("runner")
 
 
+def _get_event(name: str) -> asyncio.Event:
+    """Get an asyncio.Event stored on app_state, creating it on first use."""
+    event = getattr(app_state, name)
+    if event is None:
+        # Created lazily so it belongs to the server's event loop, not import time
+        event = asyncio.Event()
+        setattr(app_state, name, event)
+    return event
+
+
 async def web_takeover_callback(message: str) -> None:
     """
     Handle takeover request from agent by waiting for user confirmation via Web UI.
@@ -25,18 +37,57 @@ async def web_takeover_callback(message: str) -> None:
     # Log a specific event for frontend to show a modal/button
     logger.log(LogLevel.AGENT, f"Manual Intervention Required: {message}", tag="TAKEOVER")
     
-    app_state.takeover_confirmed = False
+    takeover_event = _get_event("takeover_event")
+    stop_event = _get_event("stop_event")
+    takeover_event.clear()
     
-    # Wait for confirmation
-    while not app_state.takeover_confirmed:
-        # Check if task is cancelled/stopped
-        if app_state.status_agent != "busy":
-            logger.warn("Takeover cancelled because task stopped")
-            break
-        await asyncio.sleep(0.5)
+    # Wait for confirmation, or for the task to be stopped
+    if app_state.status_agent == "busy":
+        waiters = {
+            asyncio.create_task(takeover_event.wait()),
+            asyncio.create_task(stop_event.wait()),
+        }
+        try:
+            await asyncio.wait(waiters, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for waiter in waiters:
+                waiter.cancel()
     
-    if app_state.takeover_confirmed:
+    if takeover_event.is_set():
         logger.info("Takeover confirmed by user")
+    else:
+        logger.warn("Takeover cancelled because task stopped")
+
+
+async def _step_until_stopped(step, stop_event: asyncio.Event) -> Optional[StepResult]:
+    """
+    Run one agent step, abandoning it as soon as stop_event is set.
+    
+    Args:
+        step: The agent.step(...) coroutine to run.
+        stop_event: Event set when the task is stopped or preempted.
+    
+    Returns:
+        The step result, or None if the task was stopped first.
+    """
+    step_task = asyncio.create_task(step)
+    stop_waiter = asyncio.create_task(stop_event.wait())
+    try:
+        done, _ = await asyncio.wait({step_task, stop_waiter}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        stop_waiter.cancel()
+        if not step_task.done():
+            step_task.cancel()
+            # Let the step finish unwinding (ADB calls, context updates); a
+            # preempting task awaits this whole task before resetting the agent
+            with contextlib.suppress(asyncio.CancelledError):
+                await step_task
+    return step_task.result() if step_task in done else None
+
+
+def confirm_takeover() -> None:
+    """Confirm a pending takeover request (called from the Web UI)."""
+    _get_event("takeover_event").set()
 
 
 def init_agent(use_async: bool = True) -> Optional[str]:
@@ -61,7 +112,8 @@ def init_agent(use_async: bool = True) -> Optional[str]:
             model_name=profile["model"]
         )
         agent_config = AgentConfig(
-            device_id=app_state.current_device_id
+            device_id=app_state.current_device_id,
+            max_steps=settings.agent.max_steps,
         )
         
         if use_async:
@@ -72,6 +124,9 @@ def init_agent(use_async: bool = True) -> Optional[str]:
             )
         else:
             app_state.agent = PhoneAgent(model_config, agent_config)
+        app_state.agent_supports_screenshot_provider = hasattr(
+            app_state.agent, "set_screenshot_provider"
+        )
             
         logger.info("Agent initialized successfully")
         return None
@@ -99,9 +154,40 @@ def start_task(task: str) -> tuple[str, Optional[str]]:
     # Clear old logs for new task
     # app_state.json_logs.clear()  <-- FIX: Do NOT clear logs, let them append so frontend cursor stays valid
     
+    return _claim_task_id(), None
+
+
+def continue_task() -> tuple[str, Optional[str]]:
+    """
+    Continue a failed task from where it left off.
+    
+    Returns:
+        Tuple of (task_id, error_message). Error is None on success.
+    """
+    if not app_state.agent:
+        return "", "No agent to continue"
+    return _claim_task_id(), None
+
+
+def _claim_task_id() -> str:
+    """Signal the running task, if any, to stop and make a new task id current."""
+    if app_state.status_agent == "busy" and app_state.stop_event:
+        app_state.stop_event.set()
+    
     task_id = str(uuid.uuid4())
     app_state.current_task_id = task_id
-    return task_id, None
+    return task_id
+
+
+def launch_task(task: str, task_id: str) -> None:
+    """
+    Run a task started by start_task() or continue_task() in the background.
+    
+    The new task waits for the one it preempts to unwind before touching
+    the shared agent, so two steps never run on it at once.
+    """
+    previous = app_state.agent_task
+    app_state.agent_task = asyncio.create_task(run_agent_task(task, task_id, previous))
 
 
 def stop_task() -> bool:
@@ -115,6 +201,8 @@ def stop_task() -> bool:
         app_state.agent.cancel()
         app_state.current_task_id = None
         app_state.status_agent = "ready"
+        if app_state.stop_event:
+            app_state.stop_event.set()
         print(f"\n!!! USER STOPPED TASK - Cancellation requested !!!")
         return True
     return False
@@ -125,10 +213,17 @@ def reset_agent() -> None:
     if app_state.agent:
         app_state.agent = None
     app_state.status_agent = "idle"
+    if app_state.stop_event:
+        app_state.stop_event.set()
     print("!!! AGENT RESET !!!")
 
 
-async def run_agent_task(task: str, task_id: str) -> None:
+def stream_screenshot_provider(device_id):
+    """Callback to get screenshot from stream cache."""
+    return app_state.latest_frame_tuple
+
+
+async def run_agent_task(task: str, task_id: str, previous: Optional[asyncio.Task] = None) -> None:
     """
     Execute an agent task asynchronously.
     
@@ -137,24 +232,22 @@ async def run_agent_task(task: str, task_id: str) -> None:
     Args:
         task: The task description.
         task_id: Unique identifier for this task.
+        previous: The task being preempted, cancelled and awaited before starting.
     """
+    if previous is not None and not previous.done():
+        previous.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await previous
+    
     logger.info("Task started (async)", task_id=task_id[:8], task=task)
     app_state.status_agent = "busy"
-    
-    def stream_screenshot_provider(device_id):
-        """Callback to get screenshot from stream cache."""
-        if app_state.latest_frame and app_state.original_screen_size:
-            orig_w, orig_h = app_state.original_screen_size
-            return (app_state.latest_frame, orig_w, orig_h)
-        elif app_state.latest_frame:
-            img = app_state.latest_frame
-            return (img, img.width, img.height)
-        return None
+    stop_event = _get_event("stop_event")
+    stop_event.clear()
 
     try:
         if app_state.agent:
             # Inject screenshot provider
-            if hasattr(app_state.agent, 'set_screenshot_provider'):
+            if app_state.agent_supports_screenshot_provider:
                 app_state.agent.set_screenshot_provider(stream_screenshot_provider)
             
             logger.thought("Initializing task...")
@@ -167,11 +260,11 @@ async def run_agent_task(task: str, task_id: str) -> None:
             # Start with fresh state
             app_state.agent.reset()
             
-            # First step (async!)
-            res = await app_state.agent.step(task)
+            # First step (async!), raced against stop/preemption
+            res = await _step_until_stopped(app_state.agent.step(task), stop_event)
             
             # Main execution loop
-            while not res.finished and app_state.status_agent == "busy":
+            while res is not None and not res.finished and app_state.status_agent == "busy":
                 # Check for preemption
                 if app_state.current_task_id != task_id:
                     logger.warn("Task preempted by new task", task_id=task_id[:8])
@@ -182,16 +275,16 @@ async def run_agent_task(task: str, task_id: str) -> None:
                     logger.cancelled("Task interrupted by user")
                     break
                 
-                # Yield to event loop (allow other tasks to run)
-                await asyncio.sleep(0)
-                    
                 # Next step (async!)
-                res = await app_state.agent.step()
-                
-                # Safety limit
-                if app_state.agent.step_count > 100: 
-                    logger.warn("Auto-stop: Too many steps")
-                    break
+                # Raises TaskCancelledException once agent_config.max_steps is hit
+                res = await _step_until_stopped(app_state.agent.step(), stop_event)
+            
+            if res is None:
+                if app_state.current_task_id not in (task_id, None):
+                    logger.warn("Task preempted by new task", task_id=task_id[:8])
+                else:
+                    logger.cancelled("Task interrupted by user")
+                return
             
             # Log final result
             if res.finished and app_state.current_task_id == task_id:
@@ -206,7 +299,10 @@ async def run_agent_task(task: str, task_id: str) -> None:
                     app_state.agent.reset()
                 
     except asyncio.CancelledError:
-        logger.cancelled("Task cancelled")
+        if app_state.current_task_id not in (task_id, None):
+            logger.warn("Task preempted by new task", task_id=task_id[:8])
+        else:
+            logger.cancelled("Task cancelled")
     except TaskCancelledException as e:
         logger.cancelled(str(e))
     except Exception as e:
@@ -214,9 +310,9 @@ async def run_agent_task(task: str, task_id: str) -> None:
         import traceback
         traceback.print_exc(file=sys.stdout)
     finally:
-        # Always reset status when task ends
-        app_state.status_agent = "ready"
-        if app_state.current_task_id == task_id:
+        # Reset status when task ends, unless a newer task has taken over
+        if app_state.current_task_id in (task_id, None):
+            app_state.status_agent = "ready"
             app_state.current_task_id = None
 
 
@@ -243,8 +339,6 @@ def run_agent_task_sync(task: str, task_id: str) -> None:
                 if app_state.current_task_id != task_id:
                     break
                 res = app_state.agent.step()
-                if app_state.agent.step_count > 100: 
-                    break
             
             if res.finished:
                 logger.result(res.message or "Task Completed")
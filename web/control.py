@@ -7,8 +7,12 @@ from typing import Tuple
 from pydantic import BaseModel
 
 from phone_agent.adb import async_tap, async_swipe
-from phone_agent.adb.input import async_type_text, async_input_keyevent
+from phone_agent.adb.input import async_send_text, async_input_keyevent
 from web.state import app_state
+from phone_agent import get_logger
+
+# Module logger
+logger = get_logger("control")
 
 
 # =============================================================================
@@ -40,25 +44,35 @@ class KeyRequest(BaseModel):
 # Logic
 # =============================================================================
 
+def _screen_size() -> Tuple[int, int]:
+    """Real device resolution from app_state.original_screen_size."""
+    # Fallback if unknown (should not happen if stream is running)
+    return app_state.original_screen_size or (1080, 2400)
+
+
 def _scale_coordinates(x: float, y: float) -> Tuple[int, int]:
     """
     Convert normalized coordinates (0.0-1.0) to device coordinates.
     Uses app_state.original_screen_size for the real device resolution.
     """
-    if not app_state.original_screen_size:
-        # Fallback if unknown (should not happen if stream is running)
-        width, height = 1080, 2400
-    else:
-        width, height = app_state.original_screen_size
-        
-    device_x = int(x * width)
-    device_y = int(y * height)
+    width, height = _screen_size()
     
     # Clamp to screen bounds
-    device_x = max(0, min(device_x, width))
-    device_y = max(0, min(device_y, height))
-    
-    return device_x, device_y
+    return (
+        max(0, min(int(x * width), width)),
+        max(0, min(int(y * height), height)),
+    )
+
+
+def _scale_pair(x1: float, y1: float, x2: float, y2: float) -> Tuple[int, int, int, int]:
+    """Convert two normalized points (e.g. swipe start/end) using one screen size lookup."""
+    width, height = _screen_size()
+    return (
+        max(0, min(int(x1 * width), width)),
+        max(0, min(int(y1 * height), height)),
+        max(0, min(int(x2 * width), width)),
+        max(0, min(int(y2 * height), height)),
+    )
 
 
 async def handle_tap(req: TapRequest) -> dict:
@@ -67,7 +81,7 @@ async def handle_tap(req: TapRequest) -> dict:
     # For now, async commands usually auto-detect if no device_id passed
     
     x, y = _scale_coordinates(req.x, req.y)
-    print(f"Control: Tap at ({x}, {y})")
+    logger.debug("Tap", x=x, y=y)
     
     await async_tap(x, y)
     return {"status": "ok", "x": x, "y": y}
@@ -75,10 +89,9 @@ async def handle_tap(req: TapRequest) -> dict:
 
 async def handle_swipe(req: SwipeRequest) -> dict:
     """Handle swipe request."""
-    x1, y1 = _scale_coordinates(req.start_x, req.start_y)
-    x2, y2 = _scale_coordinates(req.end_x, req.end_y)
+    x1, y1, x2, y2 = _scale_pair(req.start_x, req.start_y, req.end_x, req.end_y)
     
-    print(f"Control: Swipe ({x1}, {y1}) -> ({x2}, {y2})")
+    logger.debug("Swipe", start=[x1, y1], end=[x2, y2])
     
     await async_swipe(x1, y1, x2, y2, req.duration)
     return {"status": "ok"}
@@ -86,24 +99,17 @@ async def handle_swipe(req: SwipeRequest) -> dict:
 
 async def handle_input(req: InputRequest) -> dict:
     """Handle text input."""
-    print(f"Control: Type text '{req.text}'")
-    
-    # 1. Ensure ADB Keyboard is active (async check/set)
-    from phone_agent.adb.input import async_detect_and_set_adb_keyboard, async_input_keyevent
-    await async_detect_and_set_adb_keyboard()
-    
-    # 2. Send text
-    await async_type_text(req.text)
+    logger.debug("Type text", text=req.text)
     
-    # 3. Optional: Send ENTER to submit (simulates clicking 'Send')
-    # This is often expected behavior in chat apps
-    await async_input_keyevent(66) # KEYCODE_ENTER
+    # Switch to ADB Keyboard, send the text and press ENTER to submit
+    # (simulates clicking 'Send', often expected in chat apps) in one shell call
+    await async_send_text(req.text, enter=True)
     
     return {"status": "ok"}
 
 
 async def handle_key(req: KeyRequest) -> dict:
     """Handle key event."""
-    print(f"Control: Key event {req.keycode}")
+    logger.debug("Key event", keycode=req.keycode)
     await async_input_keyevent(req.keycode)
     return {"status": "ok"}
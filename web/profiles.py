@@ -4,21 +4,36 @@ import os
 import json
 from typing import List, Dict, Optional
 
-# Remove load_dotenv, use settings instead
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 from phone_agent.config import settings
 
 
 PROFILES_FILE = "profiles.json"
 
+# (mtime_ns, profiles, active_profile) of the last parsed PROFILES_FILE
+_cache: Optional[tuple[int, List[Dict], Optional[Dict]]] = None
+
 
 def load_profiles() -> List[Dict]:
     """
     Load profiles from JSON file, or create defaults from unified settings.
     
+    The parsed file is cached until its mtime changes; callers must not
+    mutate the returned list in place.
+    
     Returns:
         List of profile dictionaries.
     """
-    if not os.path.exists(PROFILES_FILE):
+    global _cache
+    
+    try:
+        mtime_ns = os.stat(PROFILES_FILE).st_mtime_ns
+    except FileNotFoundError:
         # Create default profile from unified settings (config.yaml / env)
         defaults = [{
             "name": "Default (Config)",
@@ -30,17 +45,30 @@ def load_profiles() -> List[Dict]:
         }]
         save_profiles(defaults)
         return defaults
+    except OSError:
+        return []
+    
+    # Reuse the parsed profiles until the file changes on disk
+    if _cache is not None and _cache[0] == mtime_ns:
+        return _cache[1]
     
     try:
-        with open(PROFILES_FILE, "r") as f:
-            data = json.load(f)
-            # Migration: Ensure provider exists
-            for p in data:
-                if "provider" not in p:
-                    p["provider"] = "Anthropic" if "claude" in p.get("model", "").lower() else "OpenAI"
-            return data
+        if ORJSON_AVAILABLE:
+            with open(PROFILES_FILE, "rb") as f:
+                data = orjson.loads(f.read())
+        else:
+            with open(PROFILES_FILE, "r") as f:
+                data = json.load(f)
+        # Migration: Ensure provider exists
+        for p in data:
+            if "provider" not in p:
+                p["provider"] = "Anthropic" if "claude" in p.get("model", "").lower() else "OpenAI"
     except Exception:
         return []
+    
+    active = next((p for p in data if p.get("is_active")), data[0] if data else None)
+    _cache = (mtime_ns, data, active)
+    return data
 
 
 def save_profiles(profiles: List[Dict]) -> None:
@@ -50,8 +78,16 @@ def save_profiles(profiles: List[Dict]) -> None:
     Args:
         profiles: List of profile dictionaries to save.
     """
-    with open(PROFILES_FILE, "w") as f:
-        json.dump(profiles, f, indent=2)
+    global _cache
+    
+    # Same indented layout either way, so the file stays hand-editable
+    if ORJSON_AVAILABLE:
+        with open(PROFILES_FILE, "wb") as f:
+            f.write(orjson.dumps(profiles, option=orjson.OPT_INDENT_2))
+    else:
+        with open(PROFILES_FILE, "w") as f:
+            json.dump(profiles, f, indent=2)
+    _cache = None
 
 
 def get_active_profile() -> Optional[Dict]:
@@ -62,6 +98,9 @@ def get_active_profile() -> Optional[Dict]:
         Active profile dict, or first profile if none active, or None if empty.
     """
     profiles = load_profiles()
+    # load_profiles() leaves the active profile precomputed in the cache
+    if _cache is not None and _cache[1] is profiles:
+        return _cache[2]
     for p in profiles:
         if p.get("is_active"):
             return p
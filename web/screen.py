@@ -1,36 +1,54 @@
 """Screen streaming via ADB screencap."""
 
+import asyncio
 import io
-import os
-import subprocess
-import time
-from typing import Generator, Optional
+import struct
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncGenerator, Optional, Union
 
 from PIL import Image
 
 from web.state import app_state
+from phone_agent import get_logger
 from phone_agent.adb.connection import list_devices
 
 
 from phone_agent.config import settings  # Import unified settings
 
+# Module logger
+logger = get_logger("screen")
 
-def video_stream_generator() -> Generator[bytes, None, None]:
+# Frame decode/resize/encode is CPU-bound, so it runs here instead of on the
+# event loop; two workers let one frame encode while the next is processed
+_frame_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="frame")
+
+# Per-thread JPEG output buffer, reused across frames processed by that worker
+_local = threading.local()
+
+
+async def video_stream_generator() -> AsyncGenerator[bytes, None]:
     """
     Yields MJPEG frames using ADB screencap.
     
     This is a reliable fallback that works with any device.
-    Each frame is captured via `adb exec-out screencap -p`.
+    Frames come from one long-lived `adb exec-out` loop running
+    `screencap`, so there is no adb process spawn per frame. Raw
+    framebuffer output is used when supported (settings.web.stream_raw),
+    which skips PNG encoding on the device and decoding on the host.
     
     Yields:
         MJPEG frame bytes with multipart boundaries.
     """
+    loop = asyncio.get_running_loop()
+    
     # Find device
-    devices = list_devices()
+    devices = await asyncio.to_thread(list_devices)
     if not devices:
-        print("No devices found for streaming.")
+        logger.warn("No devices found for streaming")
         # Fallback to black screen
-        yield from _yield_placeholder_frames()
+        async for frame in _yield_placeholder_frames():
+            yield frame
         return
     
     # Use selected device or fallback to first one
@@ -38,63 +56,225 @@ def video_stream_generator() -> Generator[bytes, None, None]:
     
     # Verify selected device is still connected
     if device_id and not any(d.device_id == device_id for d in devices):
-        print(f"Selected device {device_id} lost, falling back to first available.")
+        logger.warn("Selected device lost, falling back to first available", device_id=device_id)
         device_id = None
         
     if not device_id:
         device_id = devices[0].device_id
         
     adb_prefix = ["adb", "-s", device_id]
+    # Pace the capture loop on the device; the pipe provides backpressure
+    interval = 1.0 / (settings.web.stream_fps or 10)
+    raw_header_size = await _probe_raw_header_size(adb_prefix) if settings.web.stream_raw else None
     
-    print(f"Starting ADB Screencap Stream for {device_id}...")
+    logger.info("Starting ADB screencap stream", device_id=device_id, format="raw" if raw_header_size else "png")
     
     frame_count = 0
-    while True:
-        try:
-            # Capture screenshot via ADB
-            result = subprocess.run(
-                adb_prefix + ["exec-out", "screencap", "-p"],
-                capture_output=True,
-                timeout=5
-            )
-            
-            if result.returncode == 0 and result.stdout:
-                frame_data = _process_screenshot(result.stdout)
+    proc: Optional[asyncio.subprocess.Process] = None
+    try:
+        while True:
+            try:
+                # One long-lived screencap loop instead of an adb spawn per frame
+                if proc is None or proc.returncode is not None:
+                    proc = await _start_screencap(adb_prefix, interval, raw=bool(raw_header_size))
+                
+                if raw_header_size:
+                    raw = await _read_raw_frame(proc.stdout, raw_header_size)
+                    job = (_process_raw_frame, *raw) if raw else None
+                else:
+                    png_data = await _read_png(proc.stdout)
+                    job = (_process_screenshot, png_data) if png_data else None
+                
+                if job is None:
+                    logger.warn("Screencap process exited, restarting")
+                    await _stop_process(proc)
+                    proc = None
+                    await asyncio.sleep(1)
+                    continue
+                
+                frame_data = await loop.run_in_executor(_frame_executor, *job)
                 if frame_data:
-                    yield (b'--frame\r\n'
-                           b'Content-Type: image/jpeg\r\n\r\n' + frame_data + b'\r\n')
+                    yield _mjpeg_part(frame_data)
                     
                     frame_count += 1
                     if frame_count % 30 == 0:
-                        print(f"Stream: {frame_count} frames captured.")
-            else:
-                stderr = result.stderr[:100] if result.stderr else 'unknown'
-                print(f"Stream: screencap failed: {stderr}")
+                        logger.debug("Stream: %d frames captured", frame_count)
                 
-            # Control FPS via settings
-            target_fps = settings.web.stream_fps or 10
-            time.sleep(1.0 / target_fps)
-            
-        except subprocess.TimeoutExpired:
-            print("Stream: screencap timeout")
-            time.sleep(0.5)
-        except Exception as e:
-            print(f"Stream Error: {e}")
-            time.sleep(1)
-
-
-def _process_screenshot(png_data: bytes) -> Optional[bytes]:
+            except Exception as e:
+                logger.error("Stream error", error=str(e))
+                await _stop_process(proc)
+                proc = None
+                await asyncio.sleep(1)
+    finally:
+        await _stop_process(proc)
+
+
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# Fixed part of each multipart/x-mixed-replace frame header
+_MJPEG_PART_HEADER = b"--frame\r\nContent-Type: image/jpeg\r\nContent-Length: "
+
+# Raw screencap pixel format -> PIL raw mode (RGBA_8888, RGBX_8888, BGRA_8888)
+_RAW_MODES = {1: "RGBX", 2: "RGBX", 5: "BGRX"}
+
+
+async def _start_screencap(
+    adb_prefix: list[str], interval: float, raw: bool = False
+) -> asyncio.subprocess.Process:
+    """Start a device-side loop that writes a screenshot every `interval` seconds."""
+    command = "screencap" if raw else "screencap -p"
+    script = f"while true; do {command}; sleep {interval:.3f}; done"
+    return await asyncio.create_subprocess_exec(
+        *adb_prefix, "exec-out", script,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL,
+    )
+
+
+async def _stop_process(proc: Optional[asyncio.subprocess.Process]) -> None:
+    """Kill a capture process if it is still running."""
+    if proc is not None and proc.returncode is None:
+        proc.kill()
+        await proc.wait()
+
+
+async def _read_exactly(stream: asyncio.StreamReader, n: int) -> Optional[bytes]:
+    """Read exactly n bytes, or return None if the stream ends first."""
+    try:
+        return await stream.readexactly(n)
+    except asyncio.IncompleteReadError:
+        return None
+
+
+async def _probe_raw_header_size(adb_prefix: list[str]) -> Optional[int]:
     """
-    Process PNG screenshot data: convert to JPEG, resize, cache.
+    Take one raw screencap to learn its header size.
+    
+    The header is width, height and pixel format as little-endian uint32s,
+    plus a color space field on Android 8+ (12 or 16 bytes in total).
+    
+    Returns:
+        Header size in bytes, or None if raw capture is unusable.
+    """
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            *adb_prefix, "exec-out", "screencap",
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+    except OSError:
+        return None
+    try:
+        data, _ = await asyncio.wait_for(proc.communicate(), timeout=5)
+    except asyncio.TimeoutError:
+        await _stop_process(proc)
+        return None
+    
+    if proc.returncode != 0 or len(data) < 12:
+        return None
+    width, height, pixel_format = struct.unpack_from("<III", data)
+    if pixel_format not in _RAW_MODES:
+        logger.warn("Unsupported raw pixel format, using PNG", pixel_format=pixel_format)
+        return None
+    header_size = len(data) - width * height * 4
+    return header_size if header_size in (12, 16) else None
+
+
+async def _read_raw_frame(
+    stream: asyncio.StreamReader, header_size: int
+) -> Optional[tuple[bytes, bytes]]:
+    """
+    Read one raw screencap frame from a byte stream.
     
     Args:
-        png_data: Raw PNG bytes from screencap.
+        stream: Stream positioned at the start of a frame header.
+        header_size: Header size from _probe_raw_header_size().
+        
+    Returns:
+        (header, pixels), or None if the stream ended first.
+    """
+    header = await _read_exactly(stream, header_size)
+    if header is None:
+        return None
+    width, height, _ = struct.unpack_from("<III", header)
+    pixels = await _read_exactly(stream, width * height * 4)
+    if pixels is None:
+        return None
+    return header, pixels
+
+
+async def _read_png(stream: asyncio.StreamReader) -> Optional[bytes]:
+    """
+    Read exactly one PNG image from a byte stream by walking its chunks.
+    
+    Args:
+        stream: Stream positioned at the start of a PNG.
+        
+    Returns:
+        The PNG bytes, or None if the stream ended first.
+        
+    Raises:
+        ValueError: If the stream is not positioned at a PNG signature.
+    """
+    signature = await _read_exactly(stream, 8)
+    if signature is None:
+        return None
+    if signature != _PNG_SIGNATURE:
+        raise ValueError("screencap stream out of sync")
+    
+    parts = [signature]
+    while True:
+        # Chunk: 4-byte big-endian length, 4-byte type, data, 4-byte CRC
+        header = await _read_exactly(stream, 8)
+        if header is None:
+            return None
+        body = await _read_exactly(stream, int.from_bytes(header[:4], "big") + 4)
+        if body is None:
+            return None
+        parts.append(header)
+        parts.append(body)
+        if header[4:] == b"IEND":
+            return b"".join(parts)
+
+
+def _mjpeg_part(jpeg: bytes) -> bytes:
+    """Build a complete MJPEG part (boundary, headers, image) as one bytes object."""
+    return b"%s%d\r\n\r\n%s\r\n" % (_MJPEG_PART_HEADER, len(jpeg), jpeg)
+
+
+def _encode_buffer() -> io.BytesIO:
+    """Get this thread's reusable encode buffer, emptied for a new frame."""
+    buf = getattr(_local, "encode_buf", None)
+    if buf is None:
+        buf = _local.encode_buf = io.BytesIO()
+    buf.seek(0)
+    buf.truncate()
+    return buf
+
+
+def _process_raw_frame(header: bytes, pixels: bytes) -> Optional[bytes]:
+    """Decode a raw screencap frame and process it like _process_screenshot."""
+    width, height, pixel_format = struct.unpack_from("<III", header)
+    rawmode = _RAW_MODES.get(pixel_format)
+    if rawmode is None:
+        logger.warn("Unsupported screencap pixel format", pixel_format=pixel_format)
+        return None
+    # Unpack straight to RGB, dropping the alpha/padding byte
+    return _process_screenshot(Image.frombytes("RGB", (width, height), pixels, "raw", rawmode))
+
+
+def _process_screenshot(frame: Union[bytes, Image.Image]) -> Optional[bytes]:
+    """
+    Process a screenshot: convert to JPEG, resize, cache.
+    
+    Args:
+        frame: PNG bytes from `screencap -p`, or an already decoded image.
         
     Returns:
         JPEG bytes or None on error.
     """
     try:
-        img = Image.open(io.BytesIO(png_data))
+        img = Image.open(io.BytesIO(frame)) if isinstance(frame, bytes) else frame
         
         # Convert RGBA to RGB (JPEG doesn't support alpha)
         if img.mode == 'RGBA':
@@ -102,38 +282,41 @@ def _process_screenshot(png_data: bytes) -> Optional[bytes]:
         
         # ⚠️ IMPORTANT: Save original screen size BEFORE resize
         # This is needed for accurate coordinate mapping in the agent
-        app_state.original_screen_size = (img.width, img.height)
+        original_size = (img.width, img.height)
+        app_state.original_screen_size = original_size
         
-        # Resize for web preview (smaller = faster)
         # Resize for web preview (smaller = faster)
         max_height = 800
         if img.height > max_height:
             scale = max_height / img.height
             new_size = (int(img.width * scale), max_height)
-            # Use BILLINEAR or NEAREST for speed (LANCZOS is slow)
-            img = img.resize(new_size, Image.Resampling.BILINEAR)
+            # Use BILLINEAR or NEAREST for speed (LANCZOS is slow); reducing_gap
+            # box-reduces by the integer factor first, so BILINEAR only runs on
+            # a near-final-size image (~4x faster for a 1080x2400 frame)
+            img = img.resize(new_size, Image.Resampling.BILINEAR, reducing_gap=1.0)
         
-        # Store latest frame for agent (resized for display)
+        # Store latest frame for agent (resized for display); the tuple is
+        # published in one assignment so frame and size always match
         app_state.latest_frame = img
+        app_state.latest_frame_tuple = (img, *original_size)
         
         # Convert to JPEG with lower quality for speed
-        out = io.BytesIO()
+        out = _encode_buffer()
         img.save(out, format="JPEG", quality=50) # Reduced from 70 to 50
         return out.getvalue()
         
     except Exception as e:
-        print(f"Stream: Image processing error: {e}")
+        logger.error("Image processing error", error=str(e))
         return None
 
 
-def _yield_placeholder_frames() -> Generator[bytes, None, None]:
+async def _yield_placeholder_frames() -> AsyncGenerator[bytes, None]:
     """Yield black placeholder frames when no device connected."""
     img = Image.new('RGB', (360, 800), color='black')
     out = io.BytesIO()
     img.save(out, format="JPEG")
-    frame_data = out.getvalue()
+    part = _mjpeg_part(out.getvalue())
     
     while True:
-        yield (b'--frame\r\n'
-               b'Content-Type: image/jpeg\r\n\r\n' + frame_data + b'\r\n')
-        time.sleep(1)
+        yield part
+        await asyncio.sleep(1)
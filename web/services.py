@@ -1,5 +1,6 @@
 """Background services for the web console."""
 
+import asyncio
 import io
 import contextlib
 import time
@@ -8,7 +9,42 @@ from web.state import app_state
 from web.profiles import get_active_profile
 
 
-def status_monitor_loop(check_system_requirements, check_model_api) -> None:
+# Poll interval bounds (seconds); the interval doubles while ADB status is unchanged
+MONITOR_MIN_INTERVAL = 10.0
+MONITOR_MAX_INTERVAL = 60.0
+
+# Model API re-check schedule (seconds): TTL after success, backoff after failure
+API_CHECK_TTL = 300.0
+API_RETRY_BASE = 30.0
+
+
+def _quiet(func, *args):
+    """Call func with stdout captured, to avoid spamming the main log."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return func(*args)
+
+
+def request_status_recheck() -> None:
+    """Mark the API status unknown and wake the monitor to re-check it now."""
+    app_state.status_api = None
+    if app_state.status_recheck_event is not None:
+        app_state.status_recheck_event.set()
+
+
+def _record_api_check(api_ok: bool, now: float) -> None:
+    """Store an API check result and schedule the next one."""
+    app_state.status_api = api_ok
+    app_state.status_api_last_check = now
+    if api_ok:
+        app_state.status_api_failures = 0
+        app_state.status_api_next_check = now + API_CHECK_TTL
+    else:
+        app_state.status_api_failures += 1
+        backoff = API_RETRY_BASE * 2 ** (app_state.status_api_failures - 1)
+        app_state.status_api_next_check = now + min(backoff, API_CHECK_TTL)
+
+
+async def status_monitor_loop(check_system_requirements, check_model_api) -> None:
     """
     Background service that periodically checks system status.
     
@@ -17,36 +53,51 @@ def status_monitor_loop(check_system_requirements, check_model_api) -> None:
     - Model API availability
     - Agent status
     
+    Polls every 10s, backing off to 60s while the ADB status stays the same
+    and dropping back to 10s as soon as it changes. The model API is only
+    re-checked every 5 minutes, or after 30s/60s/... following a failure.
+    request_status_recheck() wakes the loop early and resets the interval.
+    
     Args:
         check_system_requirements: Function to check ADB/system status.
         check_model_api: Function to check model API connectivity.
     """
+    delay = MONITOR_MIN_INTERVAL
+    last_adb_ok = None
+    # Created here so it belongs to the server's event loop
+    recheck = app_state.status_recheck_event = asyncio.Event()
+    
     while True:
+        recheck.clear()
         try:
-            # Capture output to avoid spamming the main log
-            f = io.StringIO()
-            with contextlib.redirect_stdout(f):
-                adb_ok = check_system_requirements()
+            # The checks block on subprocesses/network, so run them off the loop
+            adb_ok = await asyncio.to_thread(_quiet, check_system_requirements)
             
             profile = get_active_profile()
             
-            # Check API only if status is unknown (None)
-            # This prevents rate limiting by avoiding repeated checks
-            if app_state.status_api is None and profile:
-                with contextlib.redirect_stdout(f):
-                    try:
-                        api_ok = check_model_api(
-                            profile["base_url"], 
-                            profile["model"], 
-                            profile["api_key"]
-                        )
-                        app_state.status_api = api_ok
-                    except Exception:
-                        app_state.status_api = False
+            # Check API when status is unknown (None, e.g. after a profile change)
+            # or its TTL has expired; this keeps provider probes rare
+            now = time.monotonic()
+            if profile and (app_state.status_api is None or now >= app_state.status_api_next_check):
+                try:
+                    api_ok = await asyncio.to_thread(
+                        _quiet,
+                        check_model_api,
+                        profile["base_url"], 
+                        profile["model"], 
+                        profile["api_key"]
+                    )
+                except Exception:
+                    api_ok = False
+                _record_api_check(api_ok, now)
             
             # Update State
             app_state.status_adb = adb_ok
-            # app_state.status_api is updated conditionally above
+            if adb_ok == last_adb_ok:
+                delay = min(delay * 2, MONITOR_MAX_INTERVAL)
+            else:
+                delay = MONITOR_MIN_INTERVAL
+            last_adb_ok = adb_ok
             
             # Determine Agent Status
             if app_state.agent:
@@ -57,5 +108,11 @@ def status_monitor_loop(check_system_requirements, check_model_api) -> None:
                 
         except Exception as e:
             print(f"Monitor Error: {e}")
-            
-        time.sleep(10)  # Check every 10s
+        
+        # Sleep out the interval unless a recheck is requested meanwhile
+        try:
+            await asyncio.wait_for(recheck.wait(), delay)
+        except asyncio.TimeoutError:
+            pass
+        else:
+            delay = MONITOR_MIN_INTERVAL
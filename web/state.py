@@ -1,18 +1,143 @@
 """Global application state management."""
 
-import queue
+import asyncio
+import itertools
+import re
 import sys
+import threading
+from collections import deque
 from dataclasses import dataclass, field
-from typing import Optional, List, Dict, Any
+from typing import Optional, Dict, Any
 
 from PIL import Image
 
+from phone_agent.logging import write_stdout
+
 
 # Constants
 MAX_LOGS = 1000
+LOG_RING_SIZE = 2048  # Power of two so a sequence number maps to its slot with a mask
+
+# High-frequency polling noise kept out of the UI and console, matched in one pass
+_NOISE_RE = re.compile("|".join(map(re.escape, (
+    "GET /api/logs",
+    "GET /api/status",
+    "GET /api/screen/stream",
+    "Gen: Yielded",
+))))
+
+
+class LogRing:
+    """
+    Fixed-size ring of log lines addressed by a monotonic sequence number.
+    
+    Producers write straight into their slot, overwriting the oldest line
+    once the ring is full. Readers pass the absolute sequence number they
+    have already seen (the frontend's cursor) and get back every newer line
+    that is still in the ring, so a poll never shifts or copies the buffer.
+    Exposes put() so it can stand in for the structured logger's queue.
+    
+    Producers claim a sequence number from an itertools.count (atomic under
+    the GIL) and store (seq, line) in their slot, so readers can tell a slot
+    that is not written yet from a line that has already been overwritten.
+    Only advancing the head takes a small lock, so it never moves backwards.
+    
+    Async readers (the SSE log stream) block in wait() and are woken by
+    put() from whichever thread logged, instead of re-checking on a timer.
+    """
+    
+    def __init__(self, size: int = LOG_RING_SIZE):
+        if size & (size - 1):
+            raise ValueError(f"Ring size must be a power of two, got {size}")
+        self._size = size
+        self._mask = size - 1
+        self._ring: list = [None] * size
+        self._seq = itertools.count()
+        self._head = 0  # One past the highest claimed sequence number
+        self._head_lock = threading.Lock()
+        self._waiters: set = set()  # (loop, asyncio.Event) of readers in wait()
+    
+    @property
+    def head(self) -> int:
+        """Total number of lines written so far."""
+        return self._head
+    
+    def put(self, text: str) -> None:
+        """Append a line, evicting the oldest one if the ring is full."""
+        seq = next(self._seq)
+        self._ring[seq & self._mask] = (seq, text)
+        with self._head_lock:
+            self._head = max(self._head, seq + 1)
+        if self._waiters:
+            self._wake()
+    
+    def _wake(self) -> None:
+        """Wake every waiting reader; safe to call from any thread."""
+        for loop, event in tuple(self._waiters):
+            if not event.is_set():
+                try:
+                    loop.call_soon_threadsafe(event.set)
+                except RuntimeError:
+                    pass  # Reader's loop already closed
+    
+    async def wait(self, cursor: int, timeout: float) -> bool:
+        """
+        Wait until a line after `cursor` is written.
+        
+        Args:
+            cursor: Absolute sequence number already seen by the reader.
+            timeout: Seconds to wait at most.
+        
+        Returns:
+            True if there are newer lines, False if the wait timed out.
+        """
+        event = asyncio.Event()
+        waiter = (asyncio.get_running_loop(), event)
+        self._waiters.add(waiter)
+        try:
+            # Checked after registering, so a put() in between still wakes us
+            if self._head > cursor:
+                return True
+            await asyncio.wait_for(event.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            self._waiters.discard(waiter)
+    
+    def since(self, cursor: int) -> tuple[list, int]:
+        """
+        Get the lines written after `cursor`.
+        
+        Args:
+            cursor: Absolute sequence number already seen by the reader.
+        
+        Returns:
+            (lines, next_cursor). next_cursor stops short of the head if a
+            producer has claimed a slot but not stored its line yet.
+        """
+        head = self._head
+        lo = max(cursor, head - self._size, 0)
+        if lo >= head:
+            return [], head
+        start, end = lo & self._mask, head & self._mask
+        if start < end:
+            slots = self._ring[start:end]
+        else:
+            # Wraps past the end of the list
+            slots = self._ring[start:] + self._ring[:end]
+        
+        lines = []
+        for expected, slot in enumerate(slots, lo):
+            if slot is None or slot[0] < expected:
+                return lines, expected  # Not stored yet; re-read it next poll
+            if slot[0] == expected:
+                lines.append(slot[1])
+            # slot[0] > expected: overwritten by a newer line, which is lost
+        return lines, head
 
 
-@dataclass
+@dataclass(slots=True)
 class AppState:
     """
     Global application state container.
@@ -21,33 +146,44 @@ class AppState:
     Note: This is a singleton pattern - only one instance should exist.
     """
     agent: Any = None  # PhoneAgent instance
-    log_queue: queue.Queue = field(default_factory=queue.Queue)
-    logs: List[str] = field(default_factory=list)  # Console formatted logs
-    json_logs: List[str] = field(default_factory=list)  # JSON formatted logs for frontend
-    removed_log_count: int = 0  # Track how many logs were popped from the front
+    agent_supports_screenshot_provider: bool = False  # Probed once in init_agent
+    # Bounded to MAX_LOGS; the oldest entries are evicted in O(1) on append
+    logs: deque = field(default_factory=lambda: deque(maxlen=MAX_LOGS))  # Console formatted logs
+    json_logs: LogRing = field(default_factory=LogRing)  # JSON formatted logs for frontend, read by cursor
     current_profile: Optional[Dict] = None
     
     # Status State
     status_adb: bool = False
     status_api: Optional[bool] = None  # None means checking/unknown
+    status_api_last_check: float = 0.0  # time.monotonic() of the last API check
+    status_api_next_check: float = 0.0  # Re-check the API once monotonic time passes this
+    status_api_failures: int = 0  # Consecutive failed API checks (drives backoff)
     status_agent: str = "idle"  # idle | ready | busy
     current_task_id: Optional[str] = None  # Unique ID for the running task thread
+    agent_task: Optional[asyncio.Task] = None  # The run_agent_task coroutine driving the agent
     
     # Shared Frame Cache for Agent
     latest_frame: Optional[Image.Image] = None
     # Original screen size (width, height) before resize - needed for accurate coordinate mapping
     original_screen_size: Optional[tuple[int, int]] = None
+    # (latest_frame, original_width, original_height), what the agent's screenshot provider returns
+    latest_frame_tuple: Optional[tuple[Image.Image, int, int]] = None
     
     # Device State
     current_device_id: Optional[str] = None
     
-    # Takeover confirmation flag - set to True when user clicks "继续执行" button
-    takeover_confirmed: bool = False
+    # Set when user clicks "继续执行" button to confirm a takeover
+    # Events are created lazily inside the running event loop (see agent_runner)
+    takeover_event: Optional[asyncio.Event] = None
+    # Set when the running task is stopped, so pending waits can bail out
+    stop_event: Optional[asyncio.Event] = None
+    # Set to wake the status monitor early, e.g. after a profile change
+    status_recheck_event: Optional[asyncio.Event] = None
 
 
 class QueueLogger:
     """
-    Log interceptor that captures stdout and stores in a queue.
+    Log interceptor that captures stdout into the frontend log ring.
     
     This allows the web console to display logs in real-time.
     """
@@ -58,21 +194,13 @@ class QueueLogger:
     def write(self, text: str) -> None:
         if text.strip():
             # Filter out high-frequency polling noise from UI and Console
-            noise_patterns = [
-                "GET /api/logs",
-                "GET /api/status", 
-                "GET /api/screen/stream",
-                "Gen: Yielded"
-            ]
-            if any(pattern in text for pattern in noise_patterns):
+            if _NOISE_RE.search(text):
                 return
 
-            self.state.log_queue.put(text)
+            self.state.json_logs.put(text)
             self.state.logs.append(text)
-            if len(self.state.logs) > MAX_LOGS:
-                self.state.logs.pop(0)
-            sys.__stdout__.write(text)
-            sys.__stdout__.flush()
+            # Batched by the log writer thread instead of a flush() per line
+            write_stdout(text)
 
     def flush(self) -> None:
         sys.__stdout__.flush()
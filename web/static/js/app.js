@@ -45,7 +45,7 @@ document.addEventListener('DOMContentLoaded', () => {
     
     // 启动轮询
     setInterval(checkStatus, 1000);
-    pollLogs();
+    streamLogs();
     
     // 重置loading状态（防止刷新后卡死）
     setTimeout(() => setLoading(false), 500);
@@ -576,7 +576,22 @@ async function checkStatus(returnData = false) {
     }
 }
 
-// ===== 日志轮询 =====
+// ===== 日志推送 (SSE) =====
+function streamLogs() {
+    if (!window.EventSource) {
+        pollLogs();
+        return;
+    }
+    
+    // 断线后浏览器会自动重连，并通过 Last-Event-ID 带回游标
+    const source = new EventSource(`/api/logs/stream?since=${logCursor}`);
+    source.onmessage = (e) => {
+        appendLogs(JSON.parse(e.data));
+        logCursor = Number(e.lastEventId);
+    };
+}
+
+// ===== 日志轮询 (不支持 EventSource 时回退) =====
 async function pollLogs() {
     try {
         const res = await fetch(`/api/logs?since=${logCursor}`);
@@ -5,18 +5,29 @@ This is the main entry point for the web console.
 All business logic has been refactored into the web/ package.
 """
 
+import asyncio
+import json
 import os
 import sys
 import threading
 import webbrowser
+from functools import lru_cache
 from typing import List
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 
 from fastapi import FastAPI, Request
-from fastapi.responses import HTMLResponse, StreamingResponse
+from fastapi.responses import HTMLResponse, JSONResponse, Response, StreamingResponse
 from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
 
+try:
+    import orjson  # noqa: F401  (required by ORJSONResponse)
+    from fastapi.responses import ORJSONResponse as FastJSONResponse
+    ORJSON_AVAILABLE = True
+except ImportError:
+    FastJSONResponse = JSONResponse
+    ORJSON_AVAILABLE = False
+
 # Ensure modules are accessible
 sys.path.append(os.getcwd())
 
@@ -25,8 +36,10 @@ from web.state import app_state, QueueLogger
 from web.models import Profile, ChatRequest
 from web.profiles import load_profiles, save_profiles, get_active_profile
 from web.screen import video_stream_generator
-from web.agent_runner import start_task, stop_task, reset_agent, run_agent_task
-from web.services import status_monitor_loop
+from web.agent_runner import (
+    start_task, continue_task, launch_task, stop_task, reset_agent, confirm_takeover
+)
+from web.services import request_status_recheck, status_monitor_loop
 from web.control import (
     TapRequest, SwipeRequest, InputRequest, KeyRequest,
     handle_tap, handle_swipe, handle_input, handle_key
@@ -54,20 +67,20 @@ async def lifespan(app: FastAPI):
     sys.stdout = QueueLogger(app_state)
     
     # Start background status monitor
-    monitor_thread = threading.Thread(
-        target=status_monitor_loop,
-        args=(check_system_requirements, check_model_api),
-        daemon=True
+    monitor_task = asyncio.create_task(
+        status_monitor_loop(check_system_requirements, check_model_api)
     )
-    monitor_thread.start()
     
-    # Inject queue into structured logger
+    # Inject the log ring into the structured logger (it only needs put())
     from phone_agent.logging import set_global_queue
-    set_global_queue(app_state.log_queue)
+    set_global_queue(app_state.json_logs)
     
     yield
     
-    # Cleanup
+    # Cleanup: let the monitor unwind (e.g. an in-flight check) before exiting
+    monitor_task.cancel()
+    with suppress(asyncio.CancelledError):
+        await monitor_task
     sys.stdout = sys.__stdout__
     print("--- AutoGLM Web Console Stopped ---")
 
@@ -89,11 +102,16 @@ class ConnectRequest(BaseModel):
 class SelectDeviceRequest(BaseModel):
     device_id: str
 
+
+# Stateless (just the adb path), so one instance serves every request and thread
+adb_conn = ADBConnection()
+
+
 @app.get("/api/devices")
 async def api_list_devices():
     """List all connected devices."""
-    conn = ADBConnection()
-    devices = conn.list_devices()
+    # adb runs as a blocking subprocess; keep it off the event loop
+    devices = await asyncio.to_thread(adb_conn.list_devices)
     
     # Convert to dict list
     device_list = []
@@ -121,8 +139,7 @@ async def api_list_devices():
 @app.post("/api/device/connect")
 async def api_connect_device(req: ConnectRequest):
     """Connect to a remote device."""
-    conn = ADBConnection()
-    success, msg = conn.connect(req.address)
+    success, msg = await asyncio.to_thread(adb_conn.connect, req.address)
     if success:
         return {"status": "ok", "message": msg}
     return {"status": "error", "message": msg}
@@ -131,8 +148,7 @@ async def api_connect_device(req: ConnectRequest):
 @app.post("/api/device/disconnect")
 async def api_disconnect_device(req: ConnectRequest):
     """Disconnect a remote device."""
-    conn = ADBConnection()
-    success, msg = conn.disconnect(req.address)
+    success, msg = await asyncio.to_thread(adb_conn.disconnect, req.address)
     if success:
         if app_state.current_device_id == req.address or app_state.current_device_id == f"{req.address}:5555":
             app_state.current_device_id = None
@@ -189,8 +205,8 @@ async def screen_stream():
 
 @app.get("/api/profiles")
 async def get_profiles():
-    """Get all saved profiles."""
-    return load_profiles()
+    """Get all saved profiles (parsed once per profiles.json mtime)."""
+    return FastJSONResponse(load_profiles())
 
 
 @app.post("/api/profiles")
@@ -199,8 +215,8 @@ async def update_profiles(profiles: List[Profile]):
     data = [p.dict() for p in profiles]
     save_profiles(data)
     
-    # Force API status reset and agent re-init on next request
-    app_state.status_api = None
+    # Force an immediate API re-check and agent re-init on next request
+    request_status_recheck()
     app_state.agent = None
     
     return {"status": "ok"}
@@ -210,16 +226,33 @@ async def update_profiles(profiles: List[Profile]):
 # Status API
 # ============================================================================
 
+# Status body is four scalars, so it is formatted straight into bytes
+_STATUS_TEMPLATE = b'{"adb":%s,"api":%s,"agent":%s,"active_profile":%s}'
+
+
+@lru_cache(maxsize=64)
+def _json_str(value: str) -> bytes:
+    """JSON-encode a status string; agent states and profile names rarely change."""
+    return json.dumps(value, ensure_ascii=False).encode("utf-8")
+
+
 @app.get("/api/status")
 async def check_status():
-    """Get current system status (cached)."""
+    """Get current system status (cached).
+    
+    Polled every second by each open tab: the profile comes from the
+    mtime-validated cache (one stat, no file read) and the body is
+    formatted from a bytes template instead of going through a JSON encoder.
+    """
     active = get_active_profile()
-    return {
-        "adb": app_state.status_adb,
-        "api": app_state.status_api,
-        "agent": app_state.status_agent,
-        "active_profile": active["name"] if active else "None"
-    }
+    api = app_state.status_api
+    body = _STATUS_TEMPLATE % (
+        b"true" if app_state.status_adb else b"false",
+        b"null" if api is None else b"true" if api else b"false",
+        _json_str(app_state.status_agent),
+        _json_str(active["name"] if active else "None"),
+    )
+    return Response(body, media_type="application/json")
 
 
 # ============================================================================
@@ -229,15 +262,13 @@ async def check_status():
 @app.post("/api/chat")
 async def chat(request: ChatRequest):
     """Start a new agent task (async version)."""
-    import asyncio
-    
     task_id, error = start_task(request.task)
     
     if error:
         return {"status": "error", "message": error}
     
     # Run task as async background task (non-blocking)
-    asyncio.create_task(run_agent_task(request.task, task_id))
+    launch_task(request.task, task_id)
     return {"status": "accepted", "task_id": task_id}
 
 
@@ -252,17 +283,13 @@ async def api_stop_chat():
 @app.post("/api/chat/continue")
 async def api_continue_chat():
     """Continue a failed task from where it left off."""
-    import asyncio
-    
-    if not app_state.agent:
-        return {"status": "error", "message": "No agent to continue"}
-    
     # Agent wasn't reset on failure, so context is preserved
-    task_id = str(__import__('uuid').uuid4())
-    app_state.current_task_id = task_id
+    task_id, error = continue_task()
+    if error:
+        return {"status": "error", "message": error}
     
     # Continue task (step without new prompt uses existing context)
-    asyncio.create_task(run_agent_task("继续", task_id))
+    launch_task("继续", task_id)
     return {"status": "continuing", "task_id": task_id}
 
 
@@ -279,7 +306,7 @@ async def api_reset_chat():
 @app.post("/api/takeover_confirm")
 async def api_takeover_confirm():
     """User confirms they have completed takeover operation."""
-    app_state.takeover_confirmed = True
+    confirm_takeover()
     return {"status": "confirmed"}
 
 
@@ -289,32 +316,55 @@ async def api_takeover_confirm():
 
 @app.get("/api/logs")
 async def get_logs(since: int = 0):
-    """Get logs since the specified cursor position.
+    """Get logs since the specified cursor position (polled by the legacy UI).
     
-    This endpoint drains the log_queue (which contains JSON-formatted logs)
-    and stores them in json_logs list for frontend consumption.
+    Loggers write straight into the json_logs ring, so a poll only slices
+    the lines after the client's absolute cursor. The payload is already
+    plain lists and ints, so it is serialized directly instead of going
+    through FastAPI's jsonable_encoder walk.
     """
-    # Drain log_queue and append to json_logs
-    while not app_state.log_queue.empty():
-        try:
-            json_log = app_state.log_queue.get_nowait()
-            app_state.json_logs.append(json_log)
-            # Keep list size manageable
-            if len(app_state.json_logs) > 1000:
-                app_state.json_logs.pop(0)
-                app_state.removed_log_count += 1
-        except:
-            break
-    
-    current_total = app_state.removed_log_count + len(app_state.json_logs)
+    logs, next_cursor = app_state.json_logs.since(since)
+    return FastJSONResponse({"logs": logs, "next_cursor": next_cursor})
+
+
+LOG_STREAM_KEEPALIVE = 15.0  # Seconds of silence before an SSE comment keeps the stream open
+
+
+async def _log_event_stream(request: Request, since: int):
+    """Yield one SSE event per batch of new log lines; the event id is the cursor.
     
-    # Calculate relative index in the sliding window
-    relative_since = max(0, since - app_state.removed_log_count)
+    Sleeps until the log ring wakes it on put(), and stops once the client
+    has disconnected.
+    """
+    ring = app_state.json_logs
+    cursor = since
+    while not await request.is_disconnected():
+        logs, next_cursor = ring.since(cursor)
+        cursor = max(cursor, next_cursor)  # Also skips lines already overwritten
+        if logs:
+            yield f"id: {cursor}\ndata: {json.dumps(logs, ensure_ascii=False)}\n\n"
+        elif cursor < ring.head:
+            # A producer claimed a slot but has not stored its line yet
+            await asyncio.sleep(0)
+        elif not await ring.wait(cursor, LOG_STREAM_KEEPALIVE):
+            yield ": keepalive\n\n"
+
+
+@app.get("/api/logs/stream")
+async def stream_logs(request: Request, since: int = 0):
+    """Push logs as Server-Sent Events over one long-lived connection.
     
-    return {
-        "logs": app_state.json_logs[relative_since:],
-        "next_cursor": current_total
-    }
+    Replaces polling /api/logs in the new UI. A reconnecting EventSource
+    sends Last-Event-ID, which takes precedence over `since`.
+    """
+    last_event_id = request.headers.get("last-event-id", "")
+    if last_event_id.isdigit():
+        since = int(last_event_id)
+    return StreamingResponse(
+        _log_event_stream(request, since),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
 
 
 # ============================================================================